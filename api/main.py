@@ -35,6 +35,8 @@ sys.path.insert(0, str(project_root))
 
 from api.config import get_settings
 from api.routers import chat_router, health_router
+from src.knowledge.hybrid_search import close_http_clients
+from src.memory.mysql_memory import aclose_clients, close_clients
 
 
 # Configure logging
@@ -66,6 +68,9 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down...")
+    await close_http_clients()
+    await aclose_clients()
+    close_clients()
 
 
 # Create FastAPI app
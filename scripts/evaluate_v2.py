@@ -370,6 +370,11 @@ def parse_args():
         default=None,
         help="Path to manual_input.json with constraint overrides and manual evaluations",
     )
+    parser.add_argument(
+        "--no-lazy",
+        action="store_true",
+        help="Render all property detail cards server-side instead of on expand in the browser",
+    )
     return parser.parse_args()
 
 
@@ -836,7 +841,7 @@ def main():
 
     # Generate HTML report
     print("\n[*] Generating HTML report...")
-    report_gen = HTMLReportGenerator()
+    report_gen = HTMLReportGenerator(lazy_properties=not args.no_lazy)
     html_file = output_dir / "evaluation.html"
     report_gen.generate_report(
         evaluations=evaluations,
@@ -84,6 +84,7 @@ async def run_test_searches():
                 query=query,
                 user_id=user_id,
                 limit=5,
+                enrich_urls=False,  # url_view is never printed here
                 **params,
             )
             
@@ -0,0 +1,73 @@
+"""
+Bulk scoring kernels over (N, 6) result-code matrices.
+
+Uses Numba when it is installed; otherwise the same functions run as plain
+NumPy with identical results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+NUMBA_AVAILABLE = njit is not None
+
+
+def _score_rows_numpy(codes: np.ndarray, pass_code: int, na_code: int):
+    """Per-row CPR (1.0 when nothing is applicable) and strict-pass arrays."""
+    applicable = (codes != na_code).sum(axis=1)
+    passed = (codes == pass_code).sum(axis=1)
+    cpr = np.where(applicable > 0, passed / np.maximum(applicable, 1), 1.0)
+    return cpr, passed == applicable
+
+
+def _column_counts_numpy(codes: np.ndarray, pass_code: int, na_code: int):
+    """Per-column (passed, applicable) counts, i.e. the PCA numerators and denominators."""
+    passed = (codes == pass_code).sum(axis=0, dtype=np.int64)
+    applicable = (codes != na_code).sum(axis=0, dtype=np.int64)
+    return passed, applicable
+
+
+if NUMBA_AVAILABLE:
+
+    # Both kernels stay serial: per-query matrices are a handful of rows and
+    # there are only six columns
+    @njit(cache=True)
+    def _score_rows_jit(codes, pass_code, na_code):
+        n, m = codes.shape
+        cpr = np.empty(n, np.float64)
+        strict = np.empty(n, np.bool_)
+        for i in range(n):
+            applicable = 0
+            passed = 0
+            for j in range(m):
+                c = codes[i, j]
+                if c != na_code:
+                    applicable += 1
+                    if c == pass_code:
+                        passed += 1
+            cpr[i] = passed / applicable if applicable > 0 else 1.0
+            strict[i] = passed == applicable
+        return cpr, strict
+
+    @njit(cache=True)
+    def _column_counts_jit(codes, pass_code, na_code):
+        n, m = codes.shape
+        passed = np.zeros(m, np.int64)
+        applicable = np.zeros(m, np.int64)
+        for i in range(n):
+            for j in range(m):
+                c = codes[i, j]
+                if c != na_code:
+                    applicable[j] += 1
+                    if c == pass_code:
+                        passed[j] += 1
+        return passed, applicable
+
+    score_rows = _score_rows_jit
+    column_counts = _column_counts_jit
+else:
+    score_rows = _score_rows_numpy
+    column_counts = _column_counts_numpy
@@ -216,7 +216,7 @@ class ConstraintChecker:
             if distance <= constraint.radius_km:
                 return ConstraintResult.PASS, None, distance, None
             # FAIL with distance info
-            reason = f"Geo distance {distance:.1f}km > radius {constraint.radius_km}km. Keywords {constraint.keywords} not found in: {prop_location or 'N/A'}"
+            reason = f"Geo distance {distance:.1f}km > radius {constraint.radius_km}km. Keywords {list(constraint.keywords)} not found in: {prop_location or 'N/A'}"
             return ConstraintResult.FAIL, None, distance, reason
 
         # No keyword match and no geo data available
@@ -224,7 +224,7 @@ class ConstraintChecker:
             return ConstraintResult.MISSING, None, None, "No location data available"
 
         # FAIL - keywords not found, no geo fallback
-        reason = f"Keywords {constraint.keywords} not found in location='{prop_location}'"
+        reason = f"Keywords {list(constraint.keywords)} not found in location='{prop_location}'"
         if prop_lat is None or prop_lng is None:
             reason += ". Property has no coordinates for geo fallback"
         elif constraint.lat is None or constraint.lng is None:
@@ -3,18 +3,17 @@ Main evaluation engine for constraint-based evaluation.
 """
 
 import json
-from collections import defaultdict
 from pathlib import Path
 from typing import Optional
 
 from .models import (
-    ConstraintResult,
     GoldQuestion,
     PropertyCheck,
     QueryEvaluation,
     EvaluationMetrics,
     ConfusionMatrix,
     PerConstraintAccuracy,
+    result_codes_matrix,
 )
 from .constraint_checker import ConstraintChecker
 
@@ -148,68 +147,8 @@ class Evaluator:
         Returns:
             PerConstraintAccuracy with metrics for each constraint
         """
-        # Count pass/total for each constraint
-        counts = {
-            "property_type": {"pass": 0, "total": 0},
-            "listing_type": {"pass": 0, "total": 0},
-            "location": {"pass": 0, "total": 0},
-            "price": {"pass": 0, "total": 0},
-            "bedrooms": {"pass": 0, "total": 0},
-            "floors": {"pass": 0, "total": 0},
-        }
-
-        for eval_result in evaluations:
-            for prop_check in eval_result.property_checks:
-                # Property type
-                if prop_check.property_type_result != ConstraintResult.NA:
-                    counts["property_type"]["total"] += 1
-                    if prop_check.property_type_result == ConstraintResult.PASS:
-                        counts["property_type"]["pass"] += 1
-
-                # Listing type
-                if prop_check.listing_type_result != ConstraintResult.NA:
-                    counts["listing_type"]["total"] += 1
-                    if prop_check.listing_type_result == ConstraintResult.PASS:
-                        counts["listing_type"]["pass"] += 1
-
-                # Location
-                if prop_check.location_result != ConstraintResult.NA:
-                    counts["location"]["total"] += 1
-                    if prop_check.location_result == ConstraintResult.PASS:
-                        counts["location"]["pass"] += 1
-
-                # Price
-                if prop_check.price_result != ConstraintResult.NA:
-                    counts["price"]["total"] += 1
-                    if prop_check.price_result == ConstraintResult.PASS:
-                        counts["price"]["pass"] += 1
-
-                # Bedrooms
-                if prop_check.bedrooms_result != ConstraintResult.NA:
-                    counts["bedrooms"]["total"] += 1
-                    if prop_check.bedrooms_result == ConstraintResult.PASS:
-                        counts["bedrooms"]["pass"] += 1
-
-                # Floors
-                if prop_check.floors_result != ConstraintResult.NA:
-                    counts["floors"]["total"] += 1
-                    if prop_check.floors_result == ConstraintResult.PASS:
-                        counts["floors"]["pass"] += 1
-
-        # Calculate accuracy
-        def safe_accuracy(c: dict) -> Optional[float]:
-            if c["total"] == 0:
-                return None
-            return round(c["pass"] / c["total"], 4)
-
-        return PerConstraintAccuracy(
-            property_type=safe_accuracy(counts["property_type"]),
-            listing_type=safe_accuracy(counts["listing_type"]),
-            location=safe_accuracy(counts["location"]),
-            price=safe_accuracy(counts["price"]),
-            bedrooms=safe_accuracy(counts["bedrooms"]),
-            floors=safe_accuracy(counts["floors"]),
-        )
+        checks = [p for e in evaluations for p in e.property_checks]
+        return PerConstraintAccuracy.from_codes(result_codes_matrix(checks))
 
     def calculate_confusion_matrix(
         self,
@@ -224,20 +163,7 @@ class Evaluator:
         Returns:
             ConfusionMatrix
         """
-        cm = ConfusionMatrix()
-
-        for eval_result in evaluations:
-            category = eval_result.get_confusion_category(self.threshold_t)
-            if category == "TP":
-                cm.tp += 1
-            elif category == "FP":
-                cm.fp += 1
-            elif category == "TN":
-                cm.tn += 1
-            elif category == "FN":
-                cm.fn += 1
-
-        return cm
+        return ConfusionMatrix.from_evaluations(evaluations, self.threshold_t)
 
     def calculate_category_metrics(
         self,
@@ -252,29 +178,7 @@ class Evaluator:
         Returns:
             Dictionary of category -> metrics
         """
-        category_evals = defaultdict(list)
-        for eval_result in evaluations:
-            category_evals[eval_result.category].append(eval_result)
-
-        metrics = {}
-        for category, evals in category_evals.items():
-            successful = sum(1 for e in evals if e.is_success(self.threshold_t))
-            total_props = sum(e.num_properties for e in evals)
-            mean_cpr = (
-                sum(e.mean_cpr * e.num_properties for e in evals) / total_props
-                if total_props > 0
-                else 0.0
-            )
-
-            metrics[category] = {
-                "total_queries": len(evals),
-                "successful_queries": successful,
-                "success_rate": round(successful / len(evals), 4) if evals else 0.0,
-                "total_properties": total_props,
-                "mean_cpr": round(mean_cpr, 4),
-            }
-
-        return metrics
+        return EvaluationMetrics.category_breakdown(evaluations, self.threshold_t)
 
     def calculate_metrics(
         self,
@@ -289,45 +193,7 @@ class Evaluator:
         Returns:
             EvaluationMetrics with all calculated metrics
         """
-        total_queries = len(evaluations)
-        total_properties = sum(e.num_properties for e in evaluations)
-
-        # PCA
-        pca = self.calculate_pca(evaluations)
-
-        # Mean CPR (weighted by number of properties)
-        if total_properties > 0:
-            mean_cpr = sum(
-                e.mean_cpr * e.num_properties for e in evaluations
-            ) / total_properties
-        else:
-            mean_cpr = 0.0
-
-        # Strict success ratio
-        total_strict = sum(e.strict_success_count for e in evaluations)
-        strict_ratio = total_strict / total_properties if total_properties > 0 else 0.0
-
-        # Query success rate
-        successful = sum(1 for e in evaluations if e.is_success(self.threshold_t))
-        query_success_rate = successful / total_queries if total_queries > 0 else 0.0
-
-        # Confusion matrix
-        cm = self.calculate_confusion_matrix(evaluations)
-
-        # Category metrics
-        category_metrics = self.calculate_category_metrics(evaluations)
-
-        return EvaluationMetrics(
-            total_queries=total_queries,
-            total_properties=total_properties,
-            threshold_t=self.threshold_t,
-            pca=pca,
-            mean_cpr=mean_cpr,
-            strict_success_ratio=strict_ratio,
-            query_success_rate=query_success_rate,
-            confusion_matrix=cm,
-            category_metrics=category_metrics,
-        )
+        return EvaluationMetrics.from_query_evaluations(evaluations, self.threshold_t)
 
     def run_evaluation(
         self,
@@ -4,23 +4,127 @@ HTML report generator for evaluation results.
 
 import json
 from datetime import datetime
+from functools import lru_cache
+from html import escape
 from pathlib import Path
 from typing import Optional
 
 from .models import (
+    RESULT_FIELDS,
     ConstraintResult,
     QueryEvaluation,
     EvaluationMetrics,
     PropertyCheck,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Questions, property names and notes repeat across cards and re-renders,
+# so each unique string is escaped once
+_escape = lru_cache(maxsize=4096)(escape)
+
+# Shared defaults for queries without raw results / gold entries
+_EMPTY = ()
+_NO_GOLD = (None, "")
+
+# Review <select> options, pre-rendered for each override status
+_OVERRIDE_OPTIONS = {
+    status: "\n                ".join(
+        f'<option value="{value}" {"selected" if value == status else ""}>{label}</option>'
+        for value, label in (("auto", "Auto (use CPR)"), ("pass", "Override: PASS"), ("fail", "Override: FAIL"))
+    )
+    for status in ("auto", "pass", "fail")
+}
+
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def _dumps_json(payload) -> str:
+    """Serialize a payload for embedding in the report <script> block."""
+    if orjson is not None:
+        text = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    else:
+        text = json.dumps(payload)
+    # "<" only occurs inside JSON strings; escaping it keeps a value such as
+    # "</script>" from closing the block
+    return text.replace("<", "\\u003c")
+
+
+_BADGE_CLASS = {
+    ConstraintResult.PASS: 'badge-pass',
+    ConstraintResult.FAIL: 'badge-fail',
+    ConstraintResult.NA: 'badge-na',
+    ConstraintResult.MISSING: 'badge-missing',
+}
+
+_BADGE_TEXT = {
+    ConstraintResult.PASS: 'PASS',
+    ConstraintResult.FAIL: 'FAIL',
+    ConstraintResult.NA: 'N/A',
+    ConstraintResult.MISSING: 'MISSING',
+}
+
+
+@lru_cache(maxsize=16)
+def _badge_html(result: ConstraintResult) -> str:
+    """Non-clickable badge HTML; only a handful of distinct results exist."""
+    badge_class = _BADGE_CLASS.get(result, 'badge-na')
+    text = _BADGE_TEXT.get(result, '?')
+    return f'<span class="badge {badge_class}">{text}</span>'
+
+
+@lru_cache(maxsize=101)
+def _cpr_bar_html(pct: int) -> str:
+    """CPR progress bar HTML, keyed by the integer percentage shown."""
+    css_class = ""
+    if pct < 40:
+        css_class = "low"
+    elif pct < 60:
+        css_class = "medium"
+    return f'''
+        <div class="cpr-bar">
+            <div class="cpr-fill {css_class}" style="width: {pct}%"></div>
+        </div>
+        <span style="font-size: 12px; margin-left: 4px;">{pct}%</span>
+        '''
+
+
+@lru_cache(maxsize=64)
+def _query_card_header(category: str, expected_result: str, is_success: bool) -> tuple[str, str]:
+    """
+    Static query card fragments for a (category, expected_result, is_success) combination.
+
+    Returns the card's data-* attributes and the meta badges up to (and opening)
+    the confusion-category badge, which the caller fills in.
+    """
+    category = _escape(category)
+    card_attrs = f'data-success="{str(is_success).lower()}" data-category="{category}"'
+    expected_class = 'badge-success' if expected_result == 'has_data' else 'badge-warning'
+    success_class = 'badge-pass' if is_success else 'badge-fail'
+    meta_badges = f'''<span class="badge badge-category">{category}</span>
+                    <span class="badge {expected_class}">
+                        {_escape(expected_result)}
+                    </span>
+                    <span class="badge {success_class}">'''
+    return card_attrs, meta_badges
+
 
 class HTMLReportGenerator:
     """
     Generate detailed HTML reports for evaluation results.
     """
 
-    def __init__(self):
+    def __init__(self, lazy_properties: bool = True):
+        """
+        Args:
+            lazy_properties: Ship detailed property cards as JSON and render them
+                in the browser when a query is expanded (default). Set False to
+                render every card server-side.
+        """
+        self.lazy_properties = lazy_properties
         self.css = self._get_css()
         self.js = self._get_js()
 
@@ -730,6 +834,70 @@ class HTMLReportGenerator:
         function toggleQuery(idx) {
             const body = document.getElementById('query-body-' + idx);
             body.classList.toggle('expanded');
+
+            // Lazily render detailed property cards on first expand
+            const container = body.querySelector('.props-container');
+            if (container && !container.dataset.rendered) {
+                renderProperties(container.dataset.qid, idx, container);
+            }
+        }
+
+        const BADGE_CLASSES = {pass: 'badge-pass', fail: 'badge-fail', na: 'badge-na', missing: 'badge-missing'};
+        const BADGE_TEXT = {pass: 'PASS', fail: 'FAIL', na: 'N/A', missing: 'MISSING'};
+
+        // Row and detail values arrive HTML-escaped (see _property_detail_data)
+        function renderDetailRow(queryId, propIdx, row) {
+            const [label, extracted, gold, apiVal, result, constraint] = row;
+            const badgeClass = BADGE_CLASSES[result] || 'badge-na';
+            const text = BADGE_TEXT[result] || '?';
+            const matchClass = result === 'pass' ? 'detail-match' : result === 'fail' ? 'detail-mismatch' : '';
+            const key = queryId + '-' + propIdx + '-' + constraint;
+            return `
+            <div class="detail-row">
+                <div class="detail-label">${label}</div>
+                <div class="detail-value"><span class="extracted-value">${extracted}</span></div>
+                <div class="detail-value"><span class="gold-constraint">${gold}</span></div>
+                <div class="detail-value"><span class="api-value">${apiVal}</span></div>
+                <div class="constraint-cell ${matchClass}"><span id="badge-${key}" class="badge ${badgeClass} badge-clickable" onclick="toggleConstraint(${queryId}, ${propIdx}, '${constraint}', '${result}')" title="Click to override">${text}</span></div>
+            </div>`;
+        }
+
+        function renderPropertyDetail(queryId, queryIdx, propIdx, detail) {
+            const verifyBadge = detail.verified
+                ? '<span class="badge badge-pass">Verified</span>'
+                : '<span class="badge badge-warning">Not Verified</span>';
+            const strictBadge = detail.strict_pass
+                ? '<span class="badge badge-pass">PASS</span>'
+                : '<span class="badge badge-fail">FAIL</span>';
+            const rows = detail.rows.map(row => renderDetailRow(queryId, propIdx, row)).join('');
+            return `
+            <div class="property-detail">
+                <div class="property-detail-header" onclick="togglePropertyDetail(${queryIdx}, ${propIdx})">
+                    <span><strong>${detail.name}</strong> ${verifyBadge}</span>
+                    <span>CPR: ${detail.cpr_label} ${strictBadge}</span>
+                </div>
+                <div class="property-detail-body" id="prop-detail-${queryIdx}-${propIdx}">
+                    <p style="font-size: 12px; color: var(--gray-500); margin-bottom: 10px;">
+                        API ID: ${detail.api_id} | Slug: ${detail.slug}...
+                    </p>
+                    <div class="detail-grid">
+                        <div class="detail-grid-header">Constraint</div>
+                        <div class="detail-grid-header">Extracted</div>
+                        <div class="detail-grid-header">Gold Standard</div>
+                        <div class="detail-grid-header">API Truth</div>
+                        <div class="detail-grid-header">Result</div>
+                        ${rows}
+                    </div>
+                </div>
+            </div>`;
+        }
+
+        function renderProperties(queryId, queryIdx, container) {
+            const details = window.propertyDetails[queryId] || [];
+            container.innerHTML = details
+                .map((detail, propIdx) => renderPropertyDetail(queryId, queryIdx, propIdx, detail))
+                .join('');
+            container.dataset.rendered = 'true';
         }
 
         function togglePropertyDetail(queryIdx, propIdx) {
@@ -775,8 +943,9 @@ class HTMLReportGenerator:
         // Structure: {queryId: {propIdx: {constraint: 'pass'|'fail'|'na'}}}
         window.constraintOverrides = {};
 
-        // Original data for recalculation
-        window.originalData = {};
+        // Original data for recalculation (emitted by the report before this script)
+        window.originalData = window.originalData || {};
+        window.propertyDetails = window.propertyDetails || {};
 
         function toggleConstraint(queryId, propIdx, constraint, currentResult) {
             // Initialize structure if needed
@@ -1311,41 +1480,17 @@ class HTMLReportGenerator:
 
     def _result_badge(self, result: ConstraintResult, clickable: bool = False, badge_id: str = None, constraint: str = None) -> str:
         """Generate HTML badge for constraint result."""
-        result_str = result.value if hasattr(result, 'value') else str(result).lower()
-
-        badge_class = {
-            ConstraintResult.PASS: 'badge-pass',
-            ConstraintResult.FAIL: 'badge-fail',
-            ConstraintResult.NA: 'badge-na',
-            ConstraintResult.MISSING: 'badge-missing',
-        }.get(result, 'badge-na')
-
-        text = {
-            ConstraintResult.PASS: 'PASS',
-            ConstraintResult.FAIL: 'FAIL',
-            ConstraintResult.NA: 'N/A',
-            ConstraintResult.MISSING: 'MISSING',
-        }.get(result, '?')
-
-        if clickable and badge_id and constraint:
-            return f'<span id="badge-{badge_id}" class="badge {badge_class} badge-clickable" onclick="toggleConstraint({badge_id.split("-")[0]}, {badge_id.split("-")[1]}, \'{constraint}\', \'{result_str}\')" title="Click to override">{text}</span>'
-        else:
-            return f'<span class="badge {badge_class}">{text}</span>'
+        if not (clickable and badge_id and constraint):
+            return _badge_html(result)
+
+        result_str = result.value
+        badge_class = _BADGE_CLASS.get(result, 'badge-na')
+        text = _BADGE_TEXT.get(result, '?')
+        return f'<span id="badge-{badge_id}" class="badge {badge_class} badge-clickable" onclick="toggleConstraint({badge_id.split("-")[0]}, {badge_id.split("-")[1]}, \'{constraint}\', \'{result_str}\')" title="Click to override">{text}</span>'
 
     def _cpr_bar(self, cpr: float) -> str:
         """Generate CPR progress bar HTML."""
-        pct = int(cpr * 100)
-        css_class = ""
-        if cpr < 0.4:
-            css_class = "low"
-        elif cpr < 0.6:
-            css_class = "medium"
-        return f'''
-        <div class="cpr-bar">
-            <div class="cpr-fill {css_class}" style="width: {pct}%"></div>
-        </div>
-        <span style="font-size: 12px; margin-left: 4px;">{pct}%</span>
-        '''
+        return _cpr_bar_html(int(cpr * 100))
 
     def _format_price(self, price) -> str:
         """Format price for display."""
@@ -1366,18 +1511,52 @@ class HTMLReportGenerator:
         query_id: int = None,
     ) -> str:
         """Generate detailed property card with constraint breakdown."""
-        api_data = raw_prop.get("api_data", {})
-        verified = raw_prop.get("verified", False)
-
         # Use query_id for JavaScript (fallback to query_idx)
         qid = query_id if query_id is not None else query_idx
+        detail = self._property_detail_data(check, raw_prop, gold_constraints)
+
+        rows = "".join(self._detail_row(qid, prop_idx, *row) for row in detail["rows"])
+        verify_badge = '<span class="badge badge-pass">Verified</span>' if detail["verified"] else '<span class="badge badge-warning">Not Verified</span>'
+        strict_badge = self._result_badge(ConstraintResult.PASS if detail["strict_pass"] else ConstraintResult.FAIL)
 
-        # Build constraint detail rows with clickable badges
-        def make_row(label, extracted, gold, api_val, result, constraint_name):
-            badge_id = f"{qid}-{prop_idx}-{constraint_name}"
-            result_badge = self._result_badge(result, clickable=True, badge_id=badge_id, constraint=constraint_name)
-            match_class = "detail-match" if result == ConstraintResult.PASS else "detail-mismatch" if result == ConstraintResult.FAIL else ""
-            return f'''
+        return f'''
+        <div class="property-detail">
+            <div class="property-detail-header" onclick="togglePropertyDetail({query_idx}, {prop_idx})">
+                <span><strong>{detail["name"]}</strong> {verify_badge}</span>
+                <span>CPR: {detail["cpr_label"]} {strict_badge}</span>
+            </div>
+            <div class="property-detail-body" id="prop-detail-{query_idx}-{prop_idx}">
+                <p style="font-size: 12px; color: var(--gray-500); margin-bottom: 10px;">
+                    API ID: {detail["api_id"]} | Slug: {detail["slug"]}...
+                </p>
+                <div class="detail-grid">
+                    <div class="detail-grid-header">Constraint</div>
+                    <div class="detail-grid-header">Extracted</div>
+                    <div class="detail-grid-header">Gold Standard</div>
+                    <div class="detail-grid-header">API Truth</div>
+                    <div class="detail-grid-header">Result</div>
+                    {rows}
+                </div>
+            </div>
+        </div>
+        '''
+
+    def _detail_row(
+        self,
+        qid: int,
+        prop_idx: int,
+        label: str,
+        extracted: str,
+        gold: str,
+        api_val: str,
+        result: ConstraintResult,
+        constraint_name: str,
+    ) -> str:
+        """Generate a constraint detail row with a clickable badge."""
+        badge_id = f"{qid}-{prop_idx}-{constraint_name}"
+        result_badge = self._result_badge(result, clickable=True, badge_id=badge_id, constraint=constraint_name)
+        match_class = "detail-match" if result == ConstraintResult.PASS else "detail-mismatch" if result == ConstraintResult.FAIL else ""
+        return f'''
             <div class="detail-row">
                 <div class="detail-label">{label}</div>
                 <div class="detail-value"><span class="extracted-value">{extracted}</span></div>
@@ -1387,6 +1566,35 @@ class HTMLReportGenerator:
             </div>
             '''
 
+    def _property_detail_data(
+        self,
+        check: PropertyCheck,
+        raw_prop: dict,
+        gold_constraints: dict,
+    ) -> dict:
+        """
+        Collect display values for a detailed property card.
+
+        Shared by the server-rendered card and the lazy (browser-rendered)
+        payload, so both show the same values.
+        """
+        api_data = raw_prop.get("api_data", {})
+        verified = raw_prop.get("verified", False)
+
+        # Each row: (label, extracted, gold, api_value, result, constraint_name).
+        # Values come from the results, gold and API data, so they are escaped
+        # here for both the server-rendered and the browser-rendered card;
+        # labels and api_extra are markup built from escaped parts.
+        def make_row(label, extracted, gold, api_val, result, constraint_name, api_extra=""):
+            return (
+                label,
+                _escape(str(extracted)),
+                _escape(str(gold)),
+                _escape(str(api_val)) + api_extra,
+                result,
+                constraint_name,
+            )
+
         # Property Type
         gold_type = gold_constraints.get("property_type", "N/A")
         extracted_type = raw_prop.get("property_type", "N/A")
@@ -1429,12 +1637,12 @@ class HTMLReportGenerator:
         # Build location note with all available info
         loc_notes = []
         if check.location_keyword_match:
-            loc_notes.append(f"matched: {check.location_keyword_match}")
+            loc_notes.append(f"matched: {_escape(check.location_keyword_match)}")
         if distance_km is not None:
             radius = loc_constraint.get("radius_km") if loc_constraint else None
             if radius is not None:
                 status = "OK" if distance_km <= float(radius) else "TOO FAR"
-                loc_notes.append(f"<strong>{distance_km:.1f}km</strong> (radius: {radius}km) [{status}]")
+                loc_notes.append(f"<strong>{distance_km:.1f}km</strong> (radius: {_escape(str(radius))}km) [{status}]")
             else:
                 loc_notes.append(f"<strong>{distance_km:.1f}km</strong>")
         loc_note = f" ({', '.join(loc_notes)})" if loc_notes else ""
@@ -1442,9 +1650,12 @@ class HTMLReportGenerator:
         # Add failure reason if location check failed
         location_extra = ""
         if check.location_result == ConstraintResult.FAIL and check.location_failure_reason:
-            location_extra = f'<br><small style="color: #dc2626; font-style: italic;">Reason: {check.location_failure_reason}</small>'
+            location_extra = f'<br><small style="color: #dc2626; font-style: italic;">Reason: {_escape(check.location_failure_reason)}</small>'
 
-        location_row = make_row(f"Location{loc_note}", extracted_loc or "N/A", gold_loc, api_loc + location_extra or "N/A", check.location_result, "location")
+        location_row = make_row(
+            f"Location{loc_note}", extracted_loc or "N/A", gold_loc, api_loc or "N/A",
+            check.location_result, "location", api_extra=location_extra,
+        )
 
         # Price
         price_constraint = gold_constraints.get("price", {})
@@ -1493,37 +1704,18 @@ class HTMLReportGenerator:
         api_floors = str(api_data.get("floors", "N/A")) if verified else "?"
         floors_row = make_row("Floors", extracted_floors, gold_floors, api_floors, check.floors_result, "floors")
 
-        # API verification status
-        verify_badge = '<span class="badge badge-pass">Verified</span>' if verified else '<span class="badge badge-warning">Not Verified</span>'
         api_id = raw_prop.get("api_id", "?")
         slug = raw_prop.get("slug", "N/A")
 
-        return f'''
-        <div class="property-detail">
-            <div class="property-detail-header" onclick="togglePropertyDetail({query_idx}, {prop_idx})">
-                <span><strong>{check.property_name[:50]}</strong> {verify_badge}</span>
-                <span>CPR: {check.cpr:.0%} {self._result_badge(ConstraintResult.PASS if check.strict_pass else ConstraintResult.FAIL)}</span>
-            </div>
-            <div class="property-detail-body" id="prop-detail-{query_idx}-{prop_idx}">
-                <p style="font-size: 12px; color: var(--gray-500); margin-bottom: 10px;">
-                    API ID: {api_id} | Slug: {slug[:50]}...
-                </p>
-                <div class="detail-grid">
-                    <div class="detail-grid-header">Constraint</div>
-                    <div class="detail-grid-header">Extracted</div>
-                    <div class="detail-grid-header">Gold Standard</div>
-                    <div class="detail-grid-header">API Truth</div>
-                    <div class="detail-grid-header">Result</div>
-                    {type_row}
-                    {listing_row}
-                    {location_row}
-                    {price_row}
-                    {bed_row}
-                    {floors_row}
-                </div>
-            </div>
-        </div>
-        '''
+        return {
+            "name": _escape(check.property_name[:50]),
+            "verified": bool(verified),
+            "cpr_label": f"{check.cpr:.0%}",
+            "strict_pass": check.strict_pass,
+            "api_id": _escape(str(api_id)),
+            "slug": _escape(str(slug)[:50]),
+            "rows": [type_row, listing_row, location_row, price_row, bed_row, floors_row],
+        }
 
     def _manual_eval_property_card(
         self,
@@ -1566,24 +1758,24 @@ class HTMLReportGenerator:
         lng = raw_prop.get("longitude") or api_data.get("longitude")
 
         # Format price
-        price_str = self._format_price(price) if price else "N/A"
+        price_str = _escape(self._format_price(price)) if price else "N/A"
 
-        # Build specs badges
+        # Build specs badges (every value comes from the results or API data)
         specs = []
         if prop_type and prop_type != "N/A":
-            specs.append(f'<span class="spec-badge">{prop_type}</span>')
+            specs.append(f'<span class="spec-badge">{_escape(str(prop_type))}</span>')
         if listing_type and listing_type != "N/A":
-            specs.append(f'<span class="spec-badge">{listing_type}</span>')
+            specs.append(f'<span class="spec-badge">{_escape(str(listing_type))}</span>')
         if bedrooms:
-            specs.append(f'<span class="spec-badge">{bedrooms} BR</span>')
+            specs.append(f'<span class="spec-badge">{_escape(str(bedrooms))} BR</span>')
         if bathrooms:
-            specs.append(f'<span class="spec-badge">{bathrooms} BA</span>')
+            specs.append(f'<span class="spec-badge">{_escape(str(bathrooms))} BA</span>')
         if floors:
-            specs.append(f'<span class="spec-badge">{floors} Floors</span>')
+            specs.append(f'<span class="spec-badge">{_escape(str(floors))} Floors</span>')
         if land_size:
-            specs.append(f'<span class="spec-badge">Land: {land_size}m²</span>')
+            specs.append(f'<span class="spec-badge">Land: {_escape(str(land_size))}m²</span>')
         if building_size:
-            specs.append(f'<span class="spec-badge">Building: {building_size}m²</span>')
+            specs.append(f'<span class="spec-badge">Building: {_escape(str(building_size))}m²</span>')
 
         specs_html = "\n".join(specs) if specs else '<span class="spec-badge">No specs</span>'
 
@@ -1593,7 +1785,7 @@ class HTMLReportGenerator:
             map_html = f'''
             <div class="google-map-container">
                 <iframe
-                    src="https://maps.google.com/maps?q={lat},{lng}&z=15&output=embed"
+                    src="https://maps.google.com/maps?q={_escape(str(lat))},{_escape(str(lng))}&amp;z=15&amp;output=embed"
                     allowfullscreen
                     loading="lazy"
                     referrerpolicy="no-referrer-when-downgrade">
@@ -1606,9 +1798,14 @@ class HTMLReportGenerator:
         # URL link
         url_html = ""
         if url_view:
-            url_html = f'<a href="{url_view}" target="_blank" class="property-url">{url_view}</a>'
+            url_esc = _escape(str(url_view))
+            # Only http(s) URLs become links; anything else (e.g. javascript:) is shown as text
+            if str(url_view).lower().startswith(("http://", "https://")):
+                url_html = f'<a href="{url_esc}" target="_blank" rel="noopener noreferrer" class="property-url">{url_esc}</a>'
+            else:
+                url_html = f'<p style="font-size: 12px; color: var(--gray-500);">{url_esc}</p>'
         elif slug:
-            url_html = f'<p style="font-size: 12px; color: var(--gray-500);">Slug: {slug}</p>'
+            url_html = f'<p style="font-size: 12px; color: var(--gray-500);">Slug: {_escape(str(slug))}</p>'
 
         # Current manual result status
         manual_status = "PENDING"
@@ -1621,13 +1818,14 @@ class HTMLReportGenerator:
             manual_status_class = "manual-fail"
 
         # Description (truncated)
-        desc_html = description[:500] + "..." if len(description) > 500 else description
+        description = str(description)
+        desc_html = _escape(description[:500] + "..." if len(description) > 500 else description)
 
         return f'''
         <div class="manual-eval-card">
             <div class="manual-eval-header">
                 <div>
-                    <strong>{prop_name[:60]}</strong>
+                    <strong>{_escape(str(prop_name)[:60])}</strong>
                     <span style="margin-left: 12px; font-size: 13px; color: var(--gray-500);">
                         {price_str}
                     </span>
@@ -1648,8 +1846,8 @@ class HTMLReportGenerator:
                     </div>
                     <div class="property-info-section">
                         <h4>Location</h4>
-                        <p style="font-size: 13px; margin-bottom: 4px;"><strong>{location}</strong></p>
-                        <p style="font-size: 12px; color: var(--gray-600);">{address}</p>
+                        <p style="font-size: 13px; margin-bottom: 4px;"><strong>{_escape(str(location))}</strong></p>
+                        <p style="font-size: 12px; color: var(--gray-600);">{_escape(str(address))}</p>
                         {map_html}
                     </div>
                 </div>
@@ -1661,7 +1859,7 @@ class HTMLReportGenerator:
 
                 <div class="manual-eval-controls">
                     <p style="font-size: 12px; color: var(--gray-600); margin-bottom: 8px;">
-                        <strong>Evaluation Criteria:</strong> {gold_notes or 'Manual evaluation required'}
+                        <strong>Evaluation Criteria:</strong> {_escape(gold_notes) if gold_notes else 'Manual evaluation required'}
                     </p>
                     <div class="manual-eval-buttons">
                         <button
@@ -1735,25 +1933,30 @@ class HTMLReportGenerator:
 
         rows = []
         for check in checks:
+            # Optional cell notes are resolved up front so the row f-string has no branches
+            keyword_note = f'<br><small>{_escape(check.location_keyword_match)}</small>' if check.location_keyword_match else ''
+            distance_note = f'<br><small>{check.location_distance_km:.1f}km</small>' if check.location_distance_km else ''
+            price_note = f'<br><small>{check.actual_price:,}</small>' if check.actual_price else ''
+            bedrooms_note = f'<br><small>{check.actual_bedrooms} BR</small>' if check.actual_bedrooms else ''
             rows.append(f'''
             <tr>
-                <td title="ID: {check.property_id}">{check.property_name[:40]}...</td>
-                <td>{self._result_badge(check.property_type_result)}</td>
-                <td>{self._result_badge(check.listing_type_result)}</td>
+                <td title="ID: {_escape(str(check.property_id))}">{_escape(check.property_name[:40])}...</td>
+                <td>{_badge_html(check.property_type_result)}</td>
+                <td>{_badge_html(check.listing_type_result)}</td>
                 <td>
-                    {self._result_badge(check.location_result)}
-                    {f'<br><small>{check.location_keyword_match}</small>' if check.location_keyword_match else ''}
-                    {f'<br><small>{check.location_distance_km:.1f}km</small>' if check.location_distance_km else ''}
+                    {_badge_html(check.location_result)}
+                    {keyword_note}
+                    {distance_note}
                 </td>
                 <td>
-                    {self._result_badge(check.price_result)}
-                    {f'<br><small>{check.actual_price:,}</small>' if check.actual_price else ''}
+                    {_badge_html(check.price_result)}
+                    {price_note}
                 </td>
                 <td>
-                    {self._result_badge(check.bedrooms_result)}
-                    {f'<br><small>{check.actual_bedrooms} BR</small>' if check.actual_bedrooms else ''}
+                    {_badge_html(check.bedrooms_result)}
+                    {bedrooms_note}
                 </td>
-                <td>{self._cpr_bar(check.cpr)}</td>
+                <td>{_cpr_bar_html(int(check.cpr * 100))}</td>
             </tr>
             ''')
 
@@ -1776,6 +1979,49 @@ class HTMLReportGenerator:
         </table>
         '''
 
+    @staticmethod
+    def _card_kind(
+        eval_result: QueryEvaluation,
+        raw_properties: Optional[list[dict]],
+        gold_constraints: Optional[dict],
+    ) -> str:
+        """Pick the property layout for a query card: manual, detailed or simple."""
+        if eval_result.is_manual_evaluation:
+            return "manual"
+        if raw_properties and gold_constraints:
+            return "detailed"
+        return "simple"
+
+    def _manual_content(self, eval_result, idx, raw_properties, gold_constraints, gold_notes) -> str:
+        """Property content for manual evaluation questions."""
+        return self._manual_eval_property_cards(
+            eval_result.query_id,
+            eval_result.property_checks,
+            raw_properties or [],
+            gold_notes,
+        )
+
+    def _detailed_content(self, eval_result, idx, raw_properties, gold_constraints, gold_notes) -> str:
+        """Property content with per-constraint breakdown (raw data available)."""
+        if not eval_result.property_checks:
+            return '<p style="color: var(--gray-500);">No properties returned</p>'
+        if self.lazy_properties:
+            # Cards are rendered by renderProperties() from window.propertyDetails
+            return f'<div class="props-container" data-qid="{eval_result.query_id}" data-idx="{idx}"></div>'
+        return self._property_table_detailed(
+            idx, eval_result.property_checks, raw_properties, gold_constraints, eval_result.query_id
+        )
+
+    def _simple_content(self, eval_result, idx, raw_properties, gold_constraints, gold_notes) -> str:
+        """Fallback property content without raw data."""
+        return self._property_table(eval_result.property_checks)
+
+    _CONTENT_RENDERERS = {
+        "manual": _manual_content,
+        "detailed": _detailed_content,
+        "simple": _simple_content,
+    }
+
     def _query_card(
         self,
         eval_result: QueryEvaluation,
@@ -1789,35 +2035,27 @@ class HTMLReportGenerator:
         is_success = eval_result.is_success(threshold)
         cm_category = eval_result.get_confusion_category(threshold)
 
-        # For manual evaluation questions, use special card layout
-        if eval_result.is_manual_evaluation:
-            property_content = self._manual_eval_property_cards(
-                eval_result.query_id,
-                eval_result.property_checks,
-                raw_properties or [],
-                gold_notes,
-            )
-        elif raw_properties and gold_constraints:
-            # Use detailed view if raw data available
-            property_content = self._property_table_detailed(
-                idx, eval_result.property_checks, raw_properties, gold_constraints, eval_result.query_id
-            )
-        else:
-            property_content = self._property_table(eval_result.property_checks)
+        # mean_cpr recomputes every property's CPR, so format it from one value
+        mean_cpr = eval_result.mean_cpr
+
+        kind = self._card_kind(eval_result, raw_properties, gold_constraints)
+        property_content = self._CONTENT_RENDERERS[kind](
+            self, eval_result, idx, raw_properties, gold_constraints, gold_notes
+        )
 
         # Show gold constraints summary
         constraints_summary = ""
         if gold_constraints:
             parts = []
             if gold_constraints.get("property_type"):
-                parts.append(f"type={gold_constraints['property_type']}")
+                parts.append(f"type={_escape(str(gold_constraints['property_type']))}")
             if gold_constraints.get("listing_type"):
-                parts.append(f"listing={gold_constraints['listing_type']}")
+                parts.append(f"listing={_escape(str(gold_constraints['listing_type']))}")
             if gold_constraints.get("location"):
                 loc = gold_constraints["location"]
                 keywords = loc.get("keywords", [])
                 if keywords:
-                    parts.append(f"loc=[{', '.join(keywords[:2])}]")
+                    parts.append(f"loc=[{_escape(', '.join(keywords[:2]))}]")
             if gold_constraints.get("price"):
                 price = gold_constraints["price"]
                 if price.get("max"):
@@ -1827,7 +2065,7 @@ class HTMLReportGenerator:
             if gold_constraints.get("bedrooms"):
                 bed = gold_constraints["bedrooms"]
                 if bed.get("min"):
-                    parts.append(f"bed>={bed['min']}")
+                    parts.append(f"bed>={_escape(str(bed['min']))}")
             constraints_summary = f'<p style="font-size: 12px; color: var(--gray-600); margin-bottom: 8px;"><strong>Gold Constraints:</strong> {" | ".join(parts)}</p>'
 
         # Build review controls HTML
@@ -1839,37 +2077,35 @@ class HTMLReportGenerator:
         <div class="review-controls">
             <label>Manual Review:</label>
             <select id="override-{eval_result.query_id}" onchange="setOverride({eval_result.query_id}, this.value)">
-                <option value="auto" {'selected' if override_status == 'auto' else ''}>Auto (use CPR)</option>
-                <option value="pass" {'selected' if override_status == 'pass' else ''}>Override: PASS</option>
-                <option value="fail" {'selected' if override_status == 'fail' else ''}>Override: FAIL</option>
+                {_OVERRIDE_OPTIONS[override_status]}
             </select>
             <input type="text" id="notes-{eval_result.query_id}" placeholder="Notes (optional)"
-                   value="{eval_result.override_notes or ''}"
+                   value="{_escape(eval_result.override_notes or '')}"
                    onchange="setNotes({eval_result.query_id}, this.value)">
         </div>
         '''
 
+        card_attrs, meta_badges = _query_card_header(
+            eval_result.category, eval_result.expected_result, is_success
+        )
+
         return f'''
-        <div class="query-card" data-success="{str(is_success).lower()}" data-category="{eval_result.category}" data-query-id="{eval_result.query_id}">
+        <div class="query-card" {card_attrs} data-query-id="{eval_result.query_id}">
             <div class="query-header" onclick="toggleQuery({idx})">
                 <span class="query-id">#{eval_result.query_id}</span>
-                <span class="query-text">{eval_result.question}</span>
+                <span class="query-text">{_escape(eval_result.question)}</span>
                 <div class="query-meta">
-                    <span class="badge badge-category">{eval_result.category}</span>
-                    <span class="badge {'badge-success' if eval_result.expected_result == 'has_data' else 'badge-warning'}">
-                        {eval_result.expected_result}
-                    </span>
-                    <span class="badge {'badge-pass' if is_success else 'badge-fail'}">
+                    {meta_badges}
                         {cm_category}
                     </span>
-                    {self._cpr_bar(eval_result.mean_cpr)}
+                    {_cpr_bar_html(int(mean_cpr * 100))}
                 </div>
             </div>
             <div class="query-body" id="query-body-{idx}">
                 {constraints_summary}
                 <p style="margin-bottom: 12px;">
                     <strong>Properties:</strong> {eval_result.num_properties} |
-                    <strong>Mean CPR:</strong> {eval_result.mean_cpr:.2%} |
+                    <strong>Mean CPR:</strong> {mean_cpr:.2%} |
                     <strong>Strict Pass:</strong> {eval_result.strict_success_count}/{eval_result.num_properties}
                 </p>
                 {property_content}
@@ -1878,30 +2114,26 @@ class HTMLReportGenerator:
         </div>
         '''
 
-    def _pca_chart(self, pca: dict) -> str:
-        """Generate PCA bar chart HTML."""
-        rows = []
-        for constraint, value in pca.items():
-            if value is not None:
-                pct = int(value * 100)
-                rows.append(f'''
-                <div class="pca-row">
-                    <span class="pca-label">{constraint.replace('_', ' ').title()}</span>
-                    <div class="pca-bar">
-                        <div class="pca-fill" style="width: {pct}%">{pct}%</div>
-                    </div>
-                </div>
-                ''')
-            else:
-                rows.append(f'''
+    def _pca_row(self, constraint: str, value: Optional[float]) -> str:
+        """Generate a single PCA bar row HTML."""
+        if value is not None:
+            pct = int(value * 100)
+            bar = f'<div class="pca-fill" style="width: {pct}%">{pct}%</div>'
+        else:
+            bar = '<span style="padding: 4px; color: var(--gray-500); font-size: 12px;">N/A</span>'
+        return f'''
                 <div class="pca-row">
                     <span class="pca-label">{constraint.replace('_', ' ').title()}</span>
                     <div class="pca-bar">
-                        <span style="padding: 4px; color: var(--gray-500); font-size: 12px;">N/A</span>
+                        {bar}
                     </div>
                 </div>
-                ''')
-        return f'<div class="pca-chart">{"".join(rows)}</div>'
+                '''
+
+    def _pca_chart(self, pca: dict) -> str:
+        """Generate PCA bar chart HTML."""
+        rows = "".join(self._pca_row(constraint, value) for constraint, value in pca.items())
+        return f'<div class="pca-chart">{rows}</div>'
 
     def _confusion_matrix_display(self, cm: dict) -> str:
         """Generate confusion matrix display HTML."""
@@ -1960,17 +2192,13 @@ class HTMLReportGenerator:
 
         metrics_dict = metrics.to_dict()
 
-        # Build lookup maps for raw data and gold constraints
+        # Build lookup maps for raw data and gold (constraints, notes) in one pass each
         raw_by_query = {}
         gold_by_query = {}
-        gold_notes_by_query = {}
-        if raw_results:
-            for r in raw_results:
-                raw_by_query[r.get("query_id", r.get("id"))] = r.get("properties", [])
-        if gold_questions:
-            for q in gold_questions:
-                gold_by_query[q.get("id")] = q.get("constraints", {})
-                gold_notes_by_query[q.get("id")] = q.get("notes", "")
+        for r in raw_results or ():
+            raw_by_query[r.get("query_id", r.get("id"))] = r.get("properties", [])
+        for q in gold_questions or ():
+            gold_by_query[q.get("id")] = (q.get("constraints", {}), q.get("notes", ""))
 
         # Build originalData for JavaScript recalculation
         original_data = {}
@@ -1985,53 +2213,68 @@ class HTMLReportGenerator:
                 prop_data = {
                     "property_id": check.property_id,
                     "property_name": check.property_name,
-                    "property_type_result": check.property_type_result.value if hasattr(check.property_type_result, 'value') else str(check.property_type_result).lower(),
-                    "listing_type_result": check.listing_type_result.value if hasattr(check.listing_type_result, 'value') else str(check.listing_type_result).lower(),
-                    "location_result": check.location_result.value if hasattr(check.location_result, 'value') else str(check.location_result).lower(),
-                    "price_result": check.price_result.value if hasattr(check.price_result, 'value') else str(check.price_result).lower(),
-                    "bedrooms_result": check.bedrooms_result.value if hasattr(check.bedrooms_result, 'value') else str(check.bedrooms_result).lower(),
-                    "floors_result": check.floors_result.value if hasattr(check.floors_result, 'value') else str(check.floors_result).lower(),
+                    **{name: getattr(check, name).value for name in RESULT_FIELDS},
                     "cpr": check.cpr,
                 }
                 query_data["properties"].append(prop_data)
-            original_data[e.query_id] = query_data
+            # String keys keep the serializer on its fast path (JSON keys are strings anyway)
+            original_data[str(e.query_id)] = query_data
+
+        # Detailed property card data, rendered client-side on expand
+        property_details = {}
+        if self.lazy_properties:
+            for e in evaluations:
+                raw_props = raw_by_query.get(e.query_id, _EMPTY)
+                gold_cons = gold_by_query.get(e.query_id, _NO_GOLD)[0]
+                if not e.property_checks or self._card_kind(e, raw_props, gold_cons) != "detailed":
+                    continue
+                details = []
+                for prop_idx, check in enumerate(e.property_checks):
+                    raw_prop = raw_props[prop_idx] if prop_idx < len(raw_props) else {}
+                    detail = self._property_detail_data(check, raw_prop, gold_cons)
+                    detail["rows"] = [
+                        [label, extracted, gold, api_val, result.value, constraint_name]
+                        for label, extracted, gold, api_val, result, constraint_name in detail["rows"]
+                    ]
+                    details.append(detail)
+                property_details[str(e.query_id)] = details
 
         # Generate query cards with detailed view if data available
-        query_cards_list = []
-        for i, e in enumerate(evaluations):
-            raw_props = raw_by_query.get(e.query_id, None)
-            gold_cons = gold_by_query.get(e.query_id, None)
-            gold_notes = gold_notes_by_query.get(e.query_id, "")
-            query_cards_list.append(
-                self._query_card(e, i, metrics.threshold_t, raw_props, gold_cons, gold_notes)
+        query_cards = "\n".join(
+            self._query_card(
+                e, i, metrics.threshold_t, raw_by_query.get(e.query_id, _EMPTY),
+                *gold_by_query.get(e.query_id, _NO_GOLD),
             )
-        query_cards = "\n".join(query_cards_list)
+            for i, e in enumerate(evaluations)
+        )
 
         # Category breakdown table
-        category_rows = []
-        for cat, cat_metrics in metrics.category_metrics.items():
-            category_rows.append(f'''
+        category_rows = "".join(
+            f'''
             <tr>
-                <td>{cat}</td>
+                <td>{_escape(cat)}</td>
                 <td>{cat_metrics['total_queries']}</td>
                 <td>{cat_metrics['successful_queries']}</td>
                 <td>{cat_metrics['success_rate']:.2%}</td>
                 <td>{cat_metrics['mean_cpr']:.2%}</td>
             </tr>
-            ''')
+            '''
+            for cat, cat_metrics in metrics.category_metrics.items()
+        )
 
+        title_esc = _escape(title)
         html = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
+    <title>{title_esc}</title>
     <style>{self.css}</style>
 </head>
 <body>
     <div class="container">
         <header>
-            <h1>{title}</h1>
+            <h1>{title_esc}</h1>
             <p class="meta">Generated: {timestamp} | Threshold T: {metrics.threshold_t}</p>
         </header>
 
@@ -2106,7 +2349,7 @@ class HTMLReportGenerator:
                         </tr>
                     </thead>
                     <tbody>
-                        {''.join(category_rows)}
+                        {category_rows}
                     </tbody>
                 </table>
             </div>
@@ -2132,8 +2375,9 @@ class HTMLReportGenerator:
     </div>
 
     <script>
-        window.evaluationData = {json.dumps(metrics_dict)};
-        window.originalData = {json.dumps(original_data)};
+        window.evaluationData = {_dumps_json(metrics_dict)};
+        window.originalData = {_dumps_json(original_data)};
+        window.propertyDetails = {_dumps_json(property_details)};
         {self.js}
     </script>
 </body>
@@ -2141,8 +2385,13 @@ class HTMLReportGenerator:
 '''
 
         if output_path:
-            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(html)
+            self._write_html(output_path, html)
 
         return html
+
+    def _write_html(self, path: str | Path, html: str) -> None:
+        """Write report HTML, creating parent directories as needed."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Reports run to megabytes; a 1 MB buffer flushes them in a few large writes
+        with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(html)
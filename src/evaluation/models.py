@@ -2,9 +2,16 @@
 Data models for constraint-based evaluation.
 """
 
-from dataclasses import dataclass, field
+from collections import defaultdict
+from dataclasses import astuple, dataclass, field
 from enum import Enum
-from typing import Any, Optional
+from itertools import chain
+from typing import Any, Optional, TypeVar
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from ._kernels import column_counts, score_rows
 
 
 class ConstraintResult(Enum):
@@ -15,16 +22,58 @@ class ConstraintResult(Enum):
     MISSING = "missing"  # Property data missing for this constraint
 
 
-@dataclass
+# Module-level aliases for identity checks in hot paths
+_PASS = ConstraintResult.PASS
+_NA = ConstraintResult.NA
+
+
+# PropertyCheck result attributes, in display/serialization order
+RESULT_FIELDS = (
+    "property_type_result",
+    "listing_type_result",
+    "location_result",
+    "price_result",
+    "bedrooms_result",
+    "floors_result",
+)
+
+# Integer codes for ConstraintResult, used by the vectorized aggregations
+PASS_CODE = 1
+FAIL_CODE = 0
+NA_CODE = -1
+MISSING_CODE = -2
+
+RESULT_CODES = {
+    ConstraintResult.PASS: PASS_CODE,
+    ConstraintResult.FAIL: FAIL_CODE,
+    ConstraintResult.NA: NA_CODE,
+    ConstraintResult.MISSING: MISSING_CODE,
+}
+
+# PerConstraintAccuracy keys, matching the RESULT_FIELDS column order
+PCA_KEYS = tuple(name.removesuffix("_result") for name in RESULT_FIELDS)
+
+
+def result_codes_matrix(checks: list["PropertyCheck"]) -> np.ndarray:
+    """(N, 6) int8 matrix of result codes, one row per property check."""
+    codes = np.fromiter(
+        chain.from_iterable(p.result_codes for p in checks),
+        dtype=np.int8,
+        count=len(checks) * len(RESULT_FIELDS),
+    )
+    return codes.reshape(len(checks), len(RESULT_FIELDS))
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class LocationConstraint:
     """Location constraint from gold standard."""
-    keywords: list[str] = field(default_factory=list)
+    keywords: tuple[str, ...] = ()
     lat: Optional[float] = None
     lng: Optional[float] = None
     radius_km: float = 2.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class PriceConstraint:
     """Price constraint from gold standard."""
     min: Optional[int] = None
@@ -34,7 +83,7 @@ class PriceConstraint:
     tolerance: float = 0.0  # No tolerance by default - strict matching
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class BedroomConstraint:
     """Bedroom constraint from gold standard."""
     min: Optional[int] = None
@@ -42,7 +91,7 @@ class BedroomConstraint:
     exact: Optional[int] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class FloorsConstraint:
     """Floors/stories constraint from gold standard."""
     min: Optional[int] = None
@@ -50,7 +99,7 @@ class FloorsConstraint:
     exact: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Constraints:
     """All constraints for a gold question."""
     property_type: Optional[str] = None
@@ -66,41 +115,41 @@ class Constraints:
         location = None
         if "location" in data:
             loc_data = data["location"]
-            location = LocationConstraint(
-                keywords=loc_data.get("keywords", []),
+            location = _intern(LocationConstraint(
+                keywords=tuple(loc_data.get("keywords", ())),
                 lat=loc_data.get("lat"),
                 lng=loc_data.get("lng"),
                 radius_km=loc_data.get("radius_km", 2.0),
-            )
+            ))
 
         price = None
         if "price" in data:
             price_data = data["price"]
-            price = PriceConstraint(
+            price = _intern(PriceConstraint(
                 min=price_data.get("min"),
                 max=price_data.get("max"),
                 target=price_data.get("target"),
                 currency=price_data.get("currency", "IDR"),
                 tolerance=price_data.get("tolerance", 0.0),
-            )
+            ))
 
         bedrooms = None
         if "bedrooms" in data:
             bed_data = data["bedrooms"]
-            bedrooms = BedroomConstraint(
+            bedrooms = _intern(BedroomConstraint(
                 min=bed_data.get("min"),
                 max=bed_data.get("max"),
                 exact=bed_data.get("exact"),
-            )
+            ))
 
         floors = None
         if "floors" in data:
             floor_data = data["floors"]
-            floors = FloorsConstraint(
+            floors = _intern(FloorsConstraint(
                 min=floor_data.get("min"),
                 max=floor_data.get("max"),
                 exact=floor_data.get("exact"),
-            )
+            ))
 
         return cls(
             property_type=data.get("property_type"),
@@ -112,7 +161,22 @@ class Constraints:
         )
 
 
-@dataclass
+_C = TypeVar("_C")
+
+# Structurally equal sub-constraints share one instance while any gold question uses it
+_INTERNED: "WeakValueDictionary[tuple, Any]" = WeakValueDictionary()
+
+
+def _intern(constraint: _C) -> _C:
+    """Return the shared instance equal to this frozen constraint."""
+    # Keyed by (type, field values), not the instance, so entries can be
+    # collected. Each value is paired with its type: 1, 1.0 and True are
+    # equal as keys but must not share an instance.
+    key = (type(constraint), *((type(v), v) for v in astuple(constraint)))
+    return _INTERNED.setdefault(key, constraint)
+
+
+@dataclass(slots=True)
 class GoldQuestion:
     """Gold standard question with constraints."""
     id: int
@@ -142,7 +206,7 @@ class GoldQuestion:
         return self.evaluation_mode == "manual"
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyCheck:
     """Constraint check results for a single property."""
     property_id: str
@@ -169,22 +233,28 @@ class PropertyCheck:
     manual_result: Optional[str] = None  # "pass", "fail", or None (pending)
     manual_comment: str = ""
 
+    def __post_init__(self):
+        # Normalize raw values (e.g. "pass") so every result field is a ConstraintResult
+        for name in RESULT_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, ConstraintResult):
+                setattr(self, name, ConstraintResult(str(value).lower()))
+
+    # Results are read fresh on every access: overrides assign them in place
     @property
-    def all_results(self) -> list[ConstraintResult]:
+    def all_results(self) -> tuple[ConstraintResult, ...]:
         """Get all constraint results."""
-        return [
-            self.property_type_result,
-            self.listing_type_result,
-            self.location_result,
-            self.price_result,
-            self.bedrooms_result,
-            self.floors_result,
-        ]
+        return tuple(getattr(self, name) for name in RESULT_FIELDS)
 
     @property
-    def applicable_results(self) -> list[ConstraintResult]:
+    def applicable_results(self) -> tuple[ConstraintResult, ...]:
         """Get only applicable (non-NA) constraint results."""
-        return [r for r in self.all_results if r != ConstraintResult.NA]
+        return tuple(r for r in self.all_results if r is not _NA)
+
+    @property
+    def result_codes(self) -> tuple[int, ...]:
+        """Integer codes (PASS_CODE, NA_CODE, ...) of all constraint results."""
+        return tuple(RESULT_CODES[getattr(self, name)] for name in RESULT_FIELDS)
 
     @property
     def strict_pass(self) -> bool:
@@ -192,10 +262,8 @@ class PropertyCheck:
         # For manual evaluation, check manual_result
         if self.is_manual_evaluation:
             return self.manual_result == "pass"
-        applicable = self.applicable_results
-        if not applicable:
-            return True  # No constraints = pass
-        return all(r == ConstraintResult.PASS for r in applicable)
+        # No applicable constraints = pass
+        return all(c == PASS_CODE for c in self.result_codes if c != NA_CODE)
 
     @property
     def cpr(self) -> float:
@@ -209,11 +277,10 @@ class PropertyCheck:
             else:
                 return 0.0  # Pending - treated as fail until evaluated
 
-        applicable = self.applicable_results
+        applicable = [c for c in self.result_codes if c != NA_CODE]
         if not applicable:
             return 1.0
-        passed = sum(1 for r in applicable if r == ConstraintResult.PASS)
-        return passed / len(applicable)
+        return applicable.count(PASS_CODE) / len(applicable)
 
     @property
     def is_pending_manual(self) -> bool:
@@ -221,7 +288,7 @@ class PropertyCheck:
         return self.is_manual_evaluation and self.manual_result is None
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryEvaluation:
     """Evaluation results for a single query."""
     query_id: int
@@ -238,6 +305,32 @@ class QueryEvaluation:
     # Manual evaluation mode
     is_manual_evaluation: bool = False
 
+    def _results_matrix(self) -> np.ndarray:
+        """(N, 6) int8 matrix of result codes, one row per property check."""
+        return result_codes_matrix(self.property_checks)
+
+    def _scores(self) -> tuple[np.ndarray, np.ndarray, float, int]:
+        """
+        Per-property CPR / strict-pass arrays and their aggregates.
+
+        Returns (cpr, strict_pass, mean_cpr, strict_count), computed in one
+        O(n) pass over the current checks (nothing is cached, so in-place
+        overrides are always reflected).
+        """
+        checks = self.property_checks
+        cpr, strict = score_rows(self._results_matrix(), PASS_CODE, NA_CODE)
+
+        # Manual evaluations are scored by their manual result alone
+        for i, p in enumerate(checks):
+            if p.is_manual_evaluation:
+                manual_pass = p.manual_result == "pass"
+                cpr[i] = 1.0 if manual_pass else 0.0
+                strict[i] = manual_pass
+
+        # Sum in order (not np.mean) so results match per-property summation exactly
+        mean_cpr = sum(cpr.tolist()) / len(checks) if checks else 0.0
+        return cpr, strict, mean_cpr, int(strict.sum())
+
     @property
     def num_properties(self) -> int:
         """Number of properties returned."""
@@ -248,12 +341,14 @@ class QueryEvaluation:
         """Mean CPR across all properties."""
         if not self.property_checks:
             return 0.0
-        return sum(p.cpr for p in self.property_checks) / len(self.property_checks)
+        return self._scores()[2]
 
     @property
     def strict_success_count(self) -> int:
         """Count of properties that pass all constraints."""
-        return sum(1 for p in self.property_checks if p.strict_pass)
+        if not self.property_checks:
+            return 0
+        return self._scores()[3]
 
     @property
     def strict_success_ratio(self) -> float:
@@ -309,61 +404,123 @@ class QueryEvaluation:
             return "FN"
 
 
-@dataclass
-class ConfusionMatrix:
-    """Confusion matrix for query-level evaluation."""
-    tp: int = 0
-    fp: int = 0
-    tn: int = 0
-    fn: int = 0
+def _count_property(index: int, doc: str) -> property:
+    """Read/write int view of one ConfusionMatrix counter."""
+    def get(self) -> int:
+        return int(self._counts[index])
 
-    @property
-    def total(self) -> int:
-        return self.tp + self.fp + self.tn + self.fn
+    def set(self, value: int) -> None:
+        self._counts[index] = value
+        self._refresh()
 
-    @property
-    def precision(self) -> float:
-        """Precision = TP / (TP + FP)"""
-        if self.tp + self.fp == 0:
-            return 0.0
-        return self.tp / (self.tp + self.fp)
+    return property(get, set, doc=doc)
 
-    @property
-    def recall(self) -> float:
-        """Recall = TP / (TP + FN)"""
-        if self.tp + self.fn == 0:
-            return 0.0
-        return self.tp / (self.tp + self.fn)
 
-    @property
-    def f1_score(self) -> float:
-        """F1 = 2 * P * R / (P + R)"""
+class ConfusionMatrix:
+    """
+    Confusion matrix for query-level evaluation.
+
+    Counters live in one int64 array ordered [TN, FP, FN, TP] (the
+    gt_positive * 2 + pred_positive index), so merging matrices from
+    shards or folds is a single vector add.
+    """
+    __slots__ = ("_counts", "_dict", "total", "precision", "recall", "f1_score", "accuracy")
+
+    tn = _count_property(0, "True negatives")
+    fp = _count_property(1, "False positives")
+    fn = _count_property(2, "False negatives")
+    tp = _count_property(3, "True positives")
+
+    def __init__(self, tp: int = 0, fp: int = 0, tn: int = 0, fn: int = 0):
+        self._set_counts(np.array([tn, fp, fn, tp], dtype=np.int64))
+
+    def _set_counts(self, counts: np.ndarray) -> None:
+        self._counts = counts
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """Recompute the derived metrics; called whenever the counters change."""
+        tn, fp, fn, tp = self._counts.tolist()
+        self.total = tn + fp + fn + tp
+        # Precision = TP / (TP + FP), Recall = TP / (TP + FN)
+        self.precision = tp / (tp + fp) if tp + fp else 0.0
+        self.recall = tp / (tp + fn) if tp + fn else 0.0
+        # F1 = 2 * P * R / (P + R)
         p, r = self.precision, self.recall
-        if p + r == 0:
-            return 0.0
-        return 2 * p * r / (p + r)
+        self.f1_score = 2 * p * r / (p + r) if p + r else 0.0
+        # Accuracy = (TP + TN) / Total
+        self.accuracy = (tp + tn) / self.total if self.total else 0.0
+        # Rounded to_dict() payload, rebuilt on next use
+        self._dict: Optional[dict] = None
+
+    def __repr__(self) -> str:
+        return f"ConfusionMatrix(tp={self.tp}, fp={self.fp}, tn={self.tn}, fn={self.fn})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConfusionMatrix):
+            return NotImplemented
+        return bool(np.array_equal(self._counts, other._counts))
+
+    def __iadd__(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        self._counts += other._counts
+        self._refresh()
+        return self
+
+    def __add__(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        merged = ConfusionMatrix()
+        merged._set_counts(self._counts + other._counts)
+        return merged
 
-    @property
-    def accuracy(self) -> float:
-        """Accuracy = (TP + TN) / Total"""
-        if self.total == 0:
-            return 0.0
-        return (self.tp + self.tn) / self.total
+    @classmethod
+    def from_evaluations(
+        cls, evaluations: list["QueryEvaluation"], threshold: float = 0.6
+    ) -> "ConfusionMatrix":
+        """
+        Tally query evaluations in one vectorized pass.
 
-    def to_dict(self) -> dict:
-        return {
-            "tp": self.tp,
-            "fp": self.fp,
-            "tn": self.tn,
-            "fn": self.fn,
-            "precision": round(self.precision, 4),
-            "recall": round(self.recall, 4),
-            "f1_score": round(self.f1_score, 4),
-            "accuracy": round(self.accuracy, 4),
-        }
+        Same bucketing as QueryEvaluation.get_confusion_category, counted with
+        np.bincount over (gt_positive * 2 + pred_positive) -> [TN, FP, FN, TP].
+        """
+        n = len(evaluations)
+        if n == 0:
+            return cls()
 
+        gt_positive = np.fromiter(
+            (e.expected_result == "has_data" for e in evaluations), dtype=bool, count=n
+        )
+        has_results = np.fromiter((e.has_results for e in evaluations), dtype=bool, count=n)
+        has_checks = np.fromiter((bool(e.property_checks) for e in evaluations), dtype=bool, count=n)
+        # float64 so values exactly on the threshold bucket like the scalar path
+        cprs = np.fromiter(
+            (e.mean_cpr if e.property_checks else 0.0 for e in evaluations),
+            dtype=np.float64,
+            count=n,
+        )
+        pred_positive = has_results & (~has_checks | (cprs >= threshold))
 
-@dataclass
+        cm = cls()
+        cm._set_counts(np.bincount(
+            gt_positive.astype(np.int8) * 2 + pred_positive.astype(np.int8), minlength=4
+        ).astype(np.int64))
+        return cm
+
+    def to_dict(self) -> dict:
+        if self._dict is None:
+            tn, fp, fn, tp = self._counts.tolist()
+            self._dict = {
+                "tp": tp,
+                "fp": fp,
+                "tn": tn,
+                "fn": fn,
+                "precision": round(self.precision, 4),
+                "recall": round(self.recall, 4),
+                "f1_score": round(self.f1_score, 4),
+                "accuracy": round(self.accuracy, 4),
+            }
+        return self._dict.copy()
+
+
+@dataclass(slots=True)
 class PerConstraintAccuracy:
     """Per-Constraint Accuracy (PCA) metrics."""
     property_type: Optional[float] = None
@@ -373,18 +530,66 @@ class PerConstraintAccuracy:
     bedrooms: Optional[float] = None
     floors: Optional[float] = None
 
+    @classmethod
+    def from_codes(cls, codes: np.ndarray) -> "PerConstraintAccuracy":
+        """
+        Compute all six accuracies from an (N, 6) result-code matrix.
+
+        Columns follow RESULT_FIELDS; a constraint with no applicable checks is None.
+        """
+        passed, applicable = column_counts(codes, PASS_CODE, NA_CODE)
+        return cls(*(
+            round(p / t, 4) if t else None
+            for p, t in zip(passed.tolist(), applicable.tolist())
+        ))
+
     def to_dict(self) -> dict:
-        return {
-            "property_type": self.property_type,
-            "listing_type": self.listing_type,
-            "location": self.location,
-            "price": self.price,
-            "bedrooms": self.bedrooms,
-            "floors": self.floors,
+        return {name: getattr(self, name) for name in PCA_KEYS}
+
+
+def _per_query_stats(
+    evaluations: list[QueryEvaluation], threshold: float
+) -> tuple[list[int], list[float], list[bool]]:
+    """Property count, property-weighted mean CPR and success flag per query."""
+    num_props = [e.num_properties for e in evaluations]
+    weighted_cpr = [e.mean_cpr * n for e, n in zip(evaluations, num_props)]
+    successes = [e.is_success(threshold) for e in evaluations]
+    return num_props, weighted_cpr, successes
+
+
+def _category_breakdown(
+    evaluations: list[QueryEvaluation],
+    num_props: list[int],
+    weighted_cpr: list[float],
+    successes: list[bool],
+) -> dict[str, dict]:
+    # One grouping pass, then each bucket only touches its own queries
+    buckets: dict[str, list[int]] = defaultdict(list)
+    for i, e in enumerate(evaluations):
+        buckets[e.category].append(i)
+
+    metrics = {}
+    for category, idx in buckets.items():
+        successful = sum(successes[i] for i in idx)
+        total_props = sum(num_props[i] for i in idx)
+        mean_cpr = (
+            sum(weighted_cpr[i] for i in idx) / total_props
+            if total_props > 0
+            else 0.0
+        )
+
+        metrics[category] = {
+            "total_queries": len(idx),
+            "successful_queries": successful,
+            "success_rate": round(successful / len(idx), 4),
+            "total_properties": total_props,
+            "mean_cpr": round(mean_cpr, 4),
         }
 
+    return metrics
+
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationMetrics:
     """Aggregated evaluation metrics."""
     total_queries: int
@@ -407,6 +612,50 @@ class EvaluationMetrics:
     # Category breakdown
     category_metrics: dict[str, dict] = field(default_factory=dict)
 
+    @classmethod
+    def from_query_evaluations(
+        cls, evaluations: list[QueryEvaluation], threshold: float = 0.6
+    ) -> "EvaluationMetrics":
+        """
+        Aggregate all metrics from query evaluations.
+
+        Per-query scores are read once and shared by the overall and
+        per-category aggregates.
+        """
+        stats = _per_query_stats(evaluations, threshold)
+        num_props, weighted_cpr, successes = stats
+        total_queries = len(evaluations)
+        total_properties = sum(num_props)
+
+        # Mean CPR (weighted by number of properties)
+        mean_cpr = sum(weighted_cpr) / total_properties if total_properties > 0 else 0.0
+
+        total_strict = sum(e.strict_success_count for e in evaluations)
+        strict_ratio = total_strict / total_properties if total_properties > 0 else 0.0
+
+        successful = sum(successes)
+        query_success_rate = successful / total_queries if total_queries > 0 else 0.0
+
+        checks = [p for e in evaluations for p in e.property_checks]
+        return cls(
+            total_queries=total_queries,
+            total_properties=total_properties,
+            threshold_t=threshold,
+            pca=PerConstraintAccuracy.from_codes(result_codes_matrix(checks)),
+            mean_cpr=mean_cpr,
+            strict_success_ratio=strict_ratio,
+            query_success_rate=query_success_rate,
+            confusion_matrix=ConfusionMatrix.from_evaluations(evaluations, threshold),
+            category_metrics=_category_breakdown(evaluations, *stats),
+        )
+
+    @staticmethod
+    def category_breakdown(
+        evaluations: list[QueryEvaluation], threshold: float = 0.6
+    ) -> dict[str, dict]:
+        """Metrics per query category, in order of first appearance."""
+        return _category_breakdown(evaluations, *_per_query_stats(evaluations, threshold))
+
     def to_dict(self) -> dict:
         return {
             "total_queries": self.total_queries,
@@ -12,7 +12,9 @@ from .property_store import PropertyStore, create_property_store
 from .hybrid_search import (
     HybridSearchService,
     HybridSearchResult,
+    close_http_clients,
     get_cached_embedding,
+    get_cached_embedding_async,
     get_embedding_cache_stats,
 )
 
@@ -23,6 +25,8 @@ __all__ = [
     "create_property_store",
     "HybridSearchService",
     "HybridSearchResult",
+    "close_http_clients",
     "get_cached_embedding",
+    "get_cached_embedding_async",
     "get_embedding_cache_stats",
 ]
\ No newline at end of file
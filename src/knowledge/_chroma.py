@@ -0,0 +1,54 @@
+"""
+SQLite tuning for ChromaDB persistent stores.
+
+Chroma keeps its metadata, documents and write-ahead log in
+``chroma.sqlite3`` inside the persist directory and opens it with SQLite's
+defaults (rollback journal, synchronous=FULL), which fsyncs on every commit.
+"""
+
+# journal_mode=WAL is stored in the database file, so it applies to every
+# connection from then on (and leaves -wal/-shm files next to chroma.sqlite3).
+# The rest are per connection.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-262144",
+)
+
+
+def tune_sqlite(vector_store) -> bool:
+    """
+    Apply SQLITE_PRAGMAS to the SQLite database behind a langchain Chroma store.
+
+    Chroma keeps one SQLite connection per thread; the per-connection
+    pragmas land on the calling thread's connection (the one used for
+    synchronous ingest), WAL on the database as a whole.
+
+    Reaches into Chroma internals (there is no public hook), so it only
+    acts on the Python backend (chromadb < 1.0), where SqliteDB is a
+    running component of the client's system. The Rust backend (1.x)
+    owns its own SQLite connections; asking the system for a SqliteDB
+    there would build a fresh, unused one, so nothing is touched and this
+    returns False, as it does for any other layout or non-SQLite store.
+    """
+    try:
+        from chromadb.db.impl.sqlite import SqliteDB
+
+        system = vector_store._client._system
+        # Look the component up rather than system.instance(), which
+        # would create one that the client never uses
+        db = system._instances.get(SqliteDB)
+        if db is None:
+            return False
+        pool = db._conn_pool
+        conn = pool.connect()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(pragma)
+        finally:
+            pool.return_to_pool(conn)
+    except Exception:
+        return False
+    return True
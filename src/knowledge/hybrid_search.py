@@ -10,14 +10,33 @@ This gives us:
 - Smart semantic matching for vague queries ("rumah nyaman", "taman luas")
 """
 
+import asyncio
+import copy
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import weakref
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional, List, Tuple
 from dataclasses import dataclass
 
+import httpx
+import numpy as np
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
-from cachetools import TTLCache
+from cachetools import LRUCache, TTLCache
 
-from ..adapters.base import Property, SearchCriteria, SearchResult
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - pyahocorasick is optional
+    ahocorasick = None
+
+from ..adapters.base import ListingType, Property, PropertyType, SearchCriteria, SearchResult
 from ..utils.logging import get_search_logger
 from ..utils.metrics import (
     SearchMetrics,
@@ -34,8 +53,142 @@ logger = get_search_logger()
 # Embedding Cache - Reduce OpenAI API calls by ~80%
 # =============================================================================
 
-# Cache embeddings for 1 hour (3600 seconds), max 1000 queries
-_embedding_cache: TTLCache = TTLCache(maxsize=1000, ttl=3600)
+
+class TwoTierEmbeddingCache:
+    """
+    Embedding cache with an in-memory LRU (L1) in front of SQLite on disk (L2).
+
+    L2 is optional (EMBEDDING_CACHE_PATH); when set it survives restarts and
+    L1 overflow, so a query is embedded by OpenAI once per model. Disk
+    entries are keyed by a hash of model + normalized query (see _norm_key).
+    Both tiers hold float16 vectors (about 3 KB for 1536 dims instead of
+    ~50 KB as a list of Python floats); lookups return float32 values.
+
+    Safe to share between threads: the in-memory structures and the SQLite
+    connection each have their own lock, so an L1 hit never waits on disk.
+    """
+
+    def __init__(self, path: Optional[Path] = None, maxsize: int = 4096):
+        self.memory: LRUCache = LRUCache(maxsize=maxsize)
+        self.path = path
+        self.stats: Counter = Counter()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()  # memory and stats
+        self._db_lock = threading.Lock()  # SQLite connection
+
+    @staticmethod
+    def _disk_key(cache_key: str, model: str) -> str:
+        return hashlib.blake2b(f"{model}\0{cache_key}".encode(), digest_size=16).hexdigest()
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                # WAL + NORMAL: commits append to the log without an fsync each
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning("embedding_disk_cache_unavailable", path=str(self.path), error=str(e))
+                self.path = None
+        return self._conn
+
+    def contains(self, cache_key: str, model: str) -> bool:
+        """Whether the embedding is in memory (no disk access)."""
+        with self._lock:
+            return (model, cache_key) in self.memory
+
+    def get(self, cache_key: str, model: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self.memory.get((model, cache_key))
+            if vector is not None:
+                self.stats["l1_hits"] += 1
+                return vector.astype(np.float32).tolist()
+
+        row = None
+        with self._db_lock:
+            conn = self._db()
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?",
+                    (self._disk_key(cache_key, model),),
+                ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["l2_hits"] += 1
+            vector = np.frombuffer(row[0], dtype=np.float16)
+            self.memory[(model, cache_key)] = vector
+        return vector.astype(np.float32).tolist()
+
+    def put(self, cache_key: str, model: str, vector: List[float]) -> None:
+        self.put_many(model, [(cache_key, vector)])
+
+    def put_many(self, model: str, items) -> None:
+        """
+        Store (cache_key, vector) pairs: memory right away, disk in one commit.
+
+        The disk write blocks, so callers on an event loop run this in a
+        worker thread.
+        """
+        rows = []
+        with self._lock:
+            for cache_key, vector in items:
+                vector = np.asarray(vector, dtype=np.float16)
+                self.memory[(model, cache_key)] = vector
+                rows.append((self._disk_key(cache_key, model), vector.tobytes()))
+
+        with self._db_lock:
+            conn = self._db()
+            if conn is None or not rows:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    rows,
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("embedding_disk_cache_write_failed", error=str(e))
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+
+def _embedding_cache_path() -> Optional[Path]:
+    """Disk tier location; opt-in via EMBEDDING_CACHE_PATH, memory only otherwise."""
+    configured = os.getenv("EMBEDDING_CACHE_PATH")
+    return Path(configured) if configured else None
+
+
+_embedding_cache = TwoTierEmbeddingCache(path=_embedding_cache_path())
+
+
+_KEY_WORD_RE = re.compile(r"\w+")
+
+# Filler words that don't change what a query asks for
+_KEY_STOPWORDS = frozenset({"yg", "yang"})
+
+
+def _norm_key(query: str) -> str:
+    """
+    Cache key for a query: case-folded words, punctuation and filler dropped.
+
+    Only wording noise is removed ("Rumah taman, yg luas!" and "rumah taman
+    luas" share a key); every number and amenity stays in the key, so
+    queries that differ in them never share an embedding.
+    """
+    if not query:
+        return ""
+    words = _KEY_WORD_RE.findall(query.casefold())
+    return sys.intern(" ".join(w for w in words if w not in _KEY_STOPWORDS))
 
 
 def get_cached_embedding(query: str, embeddings: OpenAIEmbeddings) -> List[float]:
@@ -50,24 +203,324 @@ def get_cached_embedding(query: str, embeddings: OpenAIEmbeddings) -> List[float
         List of floats representing the embedding vector
     """
     # Normalize query for better cache hits
-    cache_key = query.strip().lower()
+    cache_key = _norm_key(query)
+    model = getattr(embeddings, "model", "")
+
+    vector = _embedding_cache.get(cache_key, model)
+    if vector is None:
+        vector = embeddings.embed_query(query)
+        _embedding_cache.put(cache_key, model, vector)
+
+    return vector
+
+
+# Concurrent cache misses arriving within this window share one embed_documents call
+_EMBED_BATCH_WINDOW_S = 0.008
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent embedding cache misses into a single API request."""
+
+    def __init__(self, embeddings: OpenAIEmbeddings):
+        self.embeddings = embeddings
+        self._pending: dict[str, asyncio.Future] = {}  # cache_key -> shared future
+        self._texts: dict[str, str] = {}  # cache_key -> text sent to the API
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def get(self, cache_key: str, query: str) -> List[float]:
+        future = self._pending.get(cache_key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[cache_key] = future
+            self._texts[cache_key] = query
+            if self._flush_task is None:
+                self._flush_task = loop.create_task(self._flush())
+                self._flush_task.add_done_callback(self._flush_done)
+        # Shield so one cancelled caller doesn't cancel the result for the others
+        return await asyncio.shield(future)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        if self._flush_task is not task:
+            return
+        # The flush ended before taking its batch (cancelled, e.g. on loop
+        # shutdown): fail the waiters and let later misses schedule a new flush
+        pending = self._pending
+        self._pending, self._texts, self._flush_task = {}, {}, None
+        for future in pending.values():
+            future.cancel()
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(_EMBED_BATCH_WINDOW_S)
+        pending, texts = self._pending, self._texts
+        self._pending, self._texts, self._flush_task = {}, {}, None
+
+        keys = list(pending)
+        try:
+            # Embedding and the cache's disk write both block, so both run
+            # in the worker thread rather than on the loop
+            vectors = await asyncio.to_thread(
+                self._embed_and_store, keys, [texts[k] for k in keys]
+            )
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug("embedding_batch", size=len(keys))
+        for key, vector in zip(keys, vectors):
+            future = pending[key]
+            if not future.done():
+                future.set_result(vector)
+
+    def _embed_and_store(self, keys: List[str], texts: List[str]) -> List[List[float]]:
+        vectors = self.embeddings.embed_documents(texts)
+        model = getattr(self.embeddings, "model", "")
+        _embedding_cache.put_many(model, zip(keys, vectors))
+        return vectors
+
+
+# One batcher per (event loop, embedding model). A batcher's futures and flush
+# task belong to the loop that created them, and the agent tools run each call
+# on its own loop (often in parallel threads), so batchers are never shared
+# across loops; they go away with their loop.
+_embedding_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _EmbeddingBatcher]]" = (
+    weakref.WeakKeyDictionary()
+)
+_embedding_batchers_lock = threading.Lock()
+
+
+def _get_embedding_batcher(embeddings: OpenAIEmbeddings, model: str) -> _EmbeddingBatcher:
+    loop = asyncio.get_running_loop()
+    with _embedding_batchers_lock:
+        batchers = _embedding_batchers.get(loop)
+        if batchers is None:
+            batchers = _embedding_batchers[loop] = {}
+    # Only this loop's thread touches its own dict
+    batcher = batchers.get(model)
+    if batcher is None:
+        batcher = batchers[model] = _EmbeddingBatcher(embeddings)
+    return batcher
+
 
-    if cache_key not in _embedding_cache:
-        _embedding_cache[cache_key] = embeddings.embed_query(query)
+async def get_cached_embedding_async(query: str, embeddings: OpenAIEmbeddings) -> List[float]:
+    """
+    Async variant of get_cached_embedding for concurrent search requests.
+
+    Cache misses from requests arriving within a few milliseconds of each
+    other are sent to OpenAI as one embed_documents batch.
+
+    Args:
+        query: The text to embed
+        embeddings: OpenAIEmbeddings instance
+
+    Returns:
+        List of floats representing the embedding vector
+    """
+    cache_key = _norm_key(query)
+    model = getattr(embeddings, "model", "")
+
+    cached = _embedding_cache.get(cache_key, model)
+    if cached is not None:
+        return cached
 
-    return _embedding_cache[cache_key]
+    return await _get_embedding_batcher(embeddings, model).get(cache_key, query)
 
 
 def get_embedding_cache_stats() -> dict:
     """Get cache statistics for monitoring."""
     return {
         "size": len(_embedding_cache),
-        "maxsize": _embedding_cache.maxsize,
-        "ttl": _embedding_cache.ttl,
+        "maxsize": _embedding_cache.memory.maxsize,
+        "disk_path": str(_embedding_cache.path) if _embedding_cache.path else None,
+        "l1_hits": _embedding_cache.stats["l1_hits"],
+        "l2_hits": _embedding_cache.stats["l2_hits"],
+        "misses": _embedding_cache.stats["misses"],
     }
 
 
-@dataclass
+# =============================================================================
+# Property document vectors for re-ranking
+# =============================================================================
+
+# Unit-normalized float32 vectors keyed by (model, property_id, updated_at), so
+# an edited listing is re-embedded and stale entries age out
+_doc_vector_cache: TTLCache = TTLCache(maxsize=8192, ttl=3600)
+
+
+def _property_doc_text(prop: Property) -> str:
+    """Short text embedded for a property during re-ranking."""
+    return f"{prop.title}. {prop.location}, {prop.city}"
+
+
+async def get_property_vectors(properties: List[Property], embeddings: OpenAIEmbeddings) -> np.ndarray:
+    """
+    Get unit-normalized embeddings for properties, one row per property.
+
+    Properties missing from the cache are embedded with a single
+    embed_documents call.
+
+    Args:
+        properties: Properties to embed
+        embeddings: OpenAIEmbeddings instance
+
+    Returns:
+        float32 array of shape (len(properties), dim)
+    """
+    model = getattr(embeddings, "model", "")
+    keys = [(model, str(p.id), p.updated_at) for p in properties]
+    rows: List[Optional[np.ndarray]] = [_doc_vector_cache.get(k) for k in keys]
+
+    missing = [i for i, row in enumerate(rows) if row is None]
+    if missing:
+        vectors = await asyncio.to_thread(
+            embeddings.embed_documents, [_property_doc_text(properties[i]) for i in missing]
+        )
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms > 0, norms, 1.0)
+        for i, vector in zip(missing, vectors):
+            rows[i] = vector
+            _doc_vector_cache[keys[i]] = vector
+        logger.debug("property_vectors_embedded", count=len(missing), cached=len(keys) - len(missing))
+
+    return np.vstack(rows)
+
+
+# Properties built from ChromaDB metadata by the fallback search, keyed by
+# property_id -> (metadata updated_at, Property). Metadata only changes on a
+# re-sync, so the enum parsing and construction are done once per property.
+_property_build_cache: TTLCache = TTLCache(maxsize=10000, ttl=3600)
+
+
+# =============================================================================
+# Amenity keyword matching for the fallback filter
+# =============================================================================
+
+# Lowercased page_content of ChromaDB documents, keyed like _property_build_cache.
+# Each entry is a full document text, so only the recently searched ones are
+# kept (a fallback search reads at most limit * 4 documents)
+_lower_text_cache: TTLCache = TTLCache(maxsize=2048, ttl=3600)
+
+
+def _lowered_page_content(doc) -> str:
+    """doc.page_content lowercased, reused across queries for the same document."""
+    prop_id = doc.metadata.get("property_id")
+    if not prop_id:
+        return (doc.page_content or "").lower()
+    key = (prop_id, doc.metadata.get("updated_at"))
+    text = _lower_text_cache.get(key)
+    if text is None:
+        text = _lower_text_cache[key] = (doc.page_content or "").lower()
+    return text
+
+
+# Amenity to Indonesian keyword mapping
+_AMENITY_ID_MAPPING = {
+    "basketball_court": ["basket", "lapangan basket"],
+    "swimming_pool": ["kolam renang", "pool", "swimming"],
+    "gym": ["gym", "fitness", "fitnes"],
+    "playground": ["playground", "taman bermain", "area bermain"],
+    "tennis_court": ["tenis", "tennis", "lapangan tenis"],
+    "jogging_track": ["jogging", "joging", "lari"],
+    "security": ["security", "keamanan", "satpam"],
+    "cctv": ["cctv"],
+    "wifi": ["wifi", "wi-fi", "internet"],
+    "ac": ["ac", "air conditioner"],
+    "furnished": ["furnished", "perabot", "furnish"],
+    "garden": ["taman", "garden"],
+    "carport": ["carport", "garasi", "parkir"],
+}
+
+
+@lru_cache(maxsize=256)
+def _expand_amenities(amenities: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Keyword variations to look for in document text for lowercased amenities.
+
+    Callers pass a sorted tuple so equivalent requests share a cache entry.
+    """
+    keywords = []
+    for a in amenities:
+        # Add original and snake_case converted
+        keywords.append(a)
+        keywords.append(a.replace("_", " "))
+        # Add Indonesian mappings if available
+        keywords.extend(_AMENITY_ID_MAPPING.get(a, ()))
+    return tuple(dict.fromkeys(keywords))
+
+
+@lru_cache(maxsize=256)
+def _keyword_matcher(keywords: frozenset):
+    """
+    Build a predicate telling whether a text contains any of the keywords.
+
+    Uses an Aho-Corasick automaton (one pass per text whatever the number
+    of keywords) when pyahocorasick is installed, else a compiled regex
+    alternation.
+    """
+    if "" in keywords:
+        return lambda text: True
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw in keywords:
+            automaton.add_word(kw, kw)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+
+    pattern = re.compile("|".join(re.escape(kw) for kw in keywords))
+    return lambda text: pattern.search(text) is not None
+
+
+# =============================================================================
+# Shared HTTP client for URL enrichment
+# =============================================================================
+
+# Keep-alive clients, one per (event loop, API base URL), reused across
+# searches. An AsyncClient's pooled connections belong to the loop that opened
+# them, so a client is never handed to another loop (the agent tools run
+# calls on their own loops, in parallel threads).
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_http_clients_lock = threading.Lock()
+
+# IDs per URL lookup request, and lookup requests in flight per search
+_URL_BATCH_SIZE = 50
+_URL_FETCH_CONCURRENCY = 8
+
+
+def _get_http_client(base_url: str) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        # Open connections reference their loop, so a closed loop's clients
+        # would otherwise keep it alive; drop them and let their sockets go
+        for dead in [other for other in _http_clients if other.is_closed()]:
+            del _http_clients[dead]
+        clients = _http_clients.setdefault(loop, {})
+    # Only this loop's thread touches its own dict
+    client = clients.get(base_url)
+    if client is None or client.is_closed:
+        client = clients[base_url] = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Accept": "application/json"},
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close this event loop's URL-enrichment HTTP clients (call on app shutdown)."""
+    with _http_clients_lock:
+        clients = _http_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+@dataclass(frozen=True, slots=True)
 class HybridSearchResult:
     """Result from hybrid search with semantic scores"""
     properties: List[Property]
@@ -144,50 +597,77 @@ class HybridSearchService:
         listing_ids = [pid for pid, src in properties_by_source.items() if src == "listing"]
         project_ids = [pid for pid, src in properties_by_source.items() if src in ("project", "proyek")]
 
-        import httpx
+        client = _get_http_client(adapter.api_url)
+        semaphore = asyncio.Semaphore(_URL_FETCH_CONCURRENCY)
+
+        # Listings (/api/v1/properties) and projects (/api/v1/projects) are independent
+        fetches = []  # (source, ids, success log event, coroutine)
+        if listing_ids:
+            fetches.append((
+                "listing", listing_ids, "fetch_listing_urls_success",
+                self._fetch_endpoint_urls(client, "/api/v1/properties", listing_ids, semaphore),
+            ))
+        if project_ids:
+            fetches.append((
+                "project", project_ids, "fetch_project_urls_success",
+                self._fetch_endpoint_urls(client, "/api/v1/projects", project_ids, semaphore),
+            ))
+
+        results = await asyncio.gather(*(f[3] for f in fetches), return_exceptions=True)
+
+        for (source, ids, event, _), urls in zip(fetches, results):
+            if isinstance(urls, Exception):
+                logger.warning("fetch_urls_from_api_failed", source=source, error=str(urls), total_ids=len(ids))
+                continue
+            url_map.update(urls)
+            logger.debug(event, count=len(ids), found=len(urls.keys() & set(ids)))
 
-        try:
-            async with httpx.AsyncClient(
-                base_url=adapter.api_url,
-                headers={"Accept": "application/json"},
-                timeout=10,
-            ) as client:
-                # Fetch listings from /api/v1/properties
-                if listing_ids:
-                    ids_param = ",".join(listing_ids)
-                    response = await client.get(
-                        "/api/v1/properties",
-                        params={"ids": ids_param, "per_page": len(listing_ids)},
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        for item in data.get("data", []):
-                            prop_id = str(item.get("id", ""))
-                            url_view = item.get("url_view", "")
-                            if prop_id and url_view:
-                                url_map[prop_id] = url_view
-                        logger.debug("fetch_listing_urls_success", count=len(listing_ids), found=len([k for k in url_map if k in listing_ids]))
-
-                # Fetch projects from /api/v1/projects
-                if project_ids:
-                    ids_param = ",".join(project_ids)
-                    response = await client.get(
-                        "/api/v1/projects",
-                        params={"ids": ids_param, "per_page": len(project_ids)},
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        for item in data.get("data", []):
-                            prop_id = str(item.get("id", ""))
-                            url_view = item.get("url_view", "")
-                            if prop_id and url_view:
-                                url_map[prop_id] = url_view
-                        logger.debug("fetch_project_urls_success", count=len(project_ids), found=len([k for k in url_map if k in project_ids]))
+        return url_map
 
-        except Exception as e:
-            logger.warning("fetch_urls_from_api_failed", error=str(e), total_ids=len(properties_by_source))
+    @staticmethod
+    async def _fetch_endpoint_urls(
+        client: httpx.AsyncClient,
+        endpoint: str,
+        ids: list[str],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[str, str]:
+        """
+        Fetch property_id -> url_view for one API endpoint.
 
-        return url_map
+        IDs are requested in batches of _URL_BATCH_SIZE, concurrently but
+        bounded by the shared semaphore, to keep query strings short. URLs
+        from batches that succeed are kept even if another batch fails.
+        """
+        async def fetch_batch(batch: list[str]) -> dict[str, str]:
+            async with semaphore:
+                response = await client.get(
+                    endpoint,
+                    params={"ids": ",".join(batch), "per_page": len(batch)},
+                )
+            urls = {}
+            if response.status_code == 200:
+                data = response.json()
+                for item in data.get("data", []):
+                    prop_id = str(item.get("id", ""))
+                    url_view = item.get("url_view", "")
+                    if prop_id and url_view:
+                        urls[prop_id] = url_view
+            return urls
+
+        batches = [ids[i:i + _URL_BATCH_SIZE] for i in range(0, len(ids), _URL_BATCH_SIZE)]
+        results = await asyncio.gather(*(fetch_batch(b) for b in batches), return_exceptions=True)
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
+
+        urls = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.warning("fetch_url_batch_failed", endpoint=endpoint, error=str(result), batch_size=len(batch))
+                continue
+            urls.update(result)
+        return urls
 
     async def search(
         self,
@@ -218,6 +698,8 @@ class HybridSearchService:
         radius_km: Optional[float] = None,
         # Skip ChromaDB fallback when API returns empty (for testing location search)
         skip_chromadb_fallback: bool = False,
+        # Look up missing url_view for ChromaDB results (off for callers that never show links)
+        enrich_urls: bool = True,
     ) -> HybridSearchResult:
         """
         Perform hybrid search with API filtering and semantic re-ranking.
@@ -231,12 +713,13 @@ class HybridSearchService:
             use_semantic_rerank: Whether to re-rank with ChromaDB
             user_id: User ID for A/B test assignment
             ab_method: Override A/B test method (for testing)
+            enrich_urls: Fetch url_view from the API for ChromaDB results lacking it.
+                Pass False when the caller never reads url_view (metrics, evaluation)
+                to skip the HTTP round trip.
 
         Returns:
             HybridSearchResult with properties and semantic scores
         """
-        from ..adapters.base import SearchCriteria, PropertyType, ListingType
-        
         # Get A/B test method if not overridden
         if ab_method is None:
             ab_method = get_ab_manager().get_method(user_id)
@@ -263,6 +746,7 @@ class HybridSearchService:
                     user_query=user_query,
                     limit=limit,
                     source=source,
+                    enrich_urls=enrich_urls,
                 )
                 metrics.chromadb_results_count = result.total
                 metrics.final_results_count = len(result.properties)
@@ -279,9 +763,12 @@ class HybridSearchService:
                 api_query = query
                 if amenities:
                     # Add amenities to search query for full-text search
-                    # This helps API find properties with CCTV, WiFi in description
-                    amenity_terms = " ".join(amenities)
-                    api_query = f"{query} {amenity_terms}"
+                    # This helps API find properties with CCTV, WiFi in description.
+                    # Skip amenities the user already typed into the query
+                    query_lower = query.lower()
+                    new_terms = [a for a in amenities if a.lower() not in query_lower]
+                    if new_terms:
+                        api_query = f"{query} {' '.join(new_terms)}"
 
                 criteria = SearchCriteria(
                     query=api_query,
@@ -327,6 +814,7 @@ class HybridSearchService:
                 amenities=amenities,
                 property_type=property_type,
                 listing_type=listing_type,
+                enrich_urls=enrich_urls,
             )
             metrics.chromadb_results_count = result.total
             metrics.final_results_count = len(result.properties)
@@ -357,15 +845,10 @@ class HybridSearchService:
             try:
                 rerank_timer = Timer()
                 with rerank_timer:
-                    # Enrich query with amenities for better semantic matching
+                    # Rank with the amenity-enriched query built for the API
                     # This helps find properties with CCTV, WiFi, etc. mentioned in description
-                    semantic_query = query
-                    if amenities:
-                        amenity_terms = " ".join(amenities)
-                        semantic_query = f"{query} {amenity_terms}"
-
-                    reranked = self._semantic_rerank(
-                        query=semantic_query,
+                    reranked = await self._semantic_rerank(
+                        query=api_query,
                         properties=api_result.properties,
                         limit=limit,
                         semantic_weight=effective_semantic_weight,
@@ -382,7 +865,9 @@ class HybridSearchService:
                 metrics.chromadb_results_count = len(reranked["scores"])
                 metrics.final_results_count = len(reranked["properties"])
                 metrics.total_latency_ms = total_timer.elapsed_ms
-                metrics.embedding_cache_hit = query.strip().lower() in _embedding_cache
+                metrics.embedding_cache_hit = _embedding_cache.contains(
+                    _norm_key(query), getattr(self.embeddings, "model", "")
+                )
                 
                 get_metrics_collector().log_search(metrics)
 
@@ -422,6 +907,7 @@ class HybridSearchService:
         amenities: Optional[List[str]] = None,
         property_type: Optional[str] = None,
         listing_type: Optional[str] = None,
+        enrich_urls: bool = True,
     ):
         """
         Fallback to pure semantic search when API returns no results.
@@ -434,6 +920,7 @@ class HybridSearchService:
         5. Filter by amenity keywords if specified (cctv, wifi, etc.)
         6. Build Property objects from ChromaDB metadata
            (ChromaDB has enough data for display: title, price, city, etc.)
+        7. Fetch missing url_view from the API (unless enrich_urls is False)
         """
         if not self.property_store:
             return HybridSearchResult(
@@ -465,51 +952,53 @@ class HybridSearchService:
         # Fall back to extracted query if user_query not provided
         semantic_query = user_query or query
 
-        query_embedding = get_cached_embedding(semantic_query, self.embeddings)
-
-        # Search with higher k when amenities filter will be applied (need more candidates)
-        # Semantic search alone can't guarantee keyword presence, so we fetch more and post-filter
-        k_search = 100 if amenities else (limit * 2 if chroma_filter else limit)
-        results = self.property_store.vector_store.similarity_search_by_vector_with_relevance_scores(
-            embedding=query_embedding,
-            k=k_search,
-            filter=chroma_filter,
-        )
+        query_embedding = await get_cached_embedding_async(semantic_query, self.embeddings)
+
+        # Chroma queries are blocking; run them off the event loop so other
+        # searches keep making progress meanwhile
+        vector_store = self.property_store.vector_store
+        if amenities:
+            amenity_keywords = _expand_amenities(tuple(sorted(a.lower() for a in amenities)))
+
+            # Push the keyword filter into ChromaDB so only matching documents
+            # come back. $contains is case-sensitive, so the lower, sentence,
+            # title and upper casings are sent ("kolam renang", "Kolam renang",
+            # "Kolam Renang", ...); the post-filter below stays as the
+            # case-insensitive check. A single filtered query is enough: a
+            # page shorter than k already holds every matching document
+            where_document = None
+            if "" not in amenity_keywords:
+                terms = sorted({
+                    v for kw in amenity_keywords
+                    for v in (kw, kw.capitalize(), kw.title(), kw.upper())
+                })
+                where_document = (
+                    {"$contains": terms[0]} if len(terms) == 1
+                    else {"$or": [{"$contains": t} for t in terms]}
+                )
+            results = await asyncio.to_thread(
+                vector_store.similarity_search_by_vector_with_relevance_scores,
+                embedding=query_embedding,
+                k=limit * 4,
+                filter=chroma_filter,
+                where_document=where_document,
+            )
+        else:
+            k_search = limit * 2 if chroma_filter else limit
+            results = await asyncio.to_thread(
+                vector_store.similarity_search_by_vector_with_relevance_scores,
+                embedding=query_embedding,
+                k=k_search,
+                filter=chroma_filter,
+            )
 
         # Post-filter by amenities keywords if specified
         if amenities and results:
-            # Amenity to Indonesian keyword mapping
-            amenity_id_mapping = {
-                "basketball_court": ["basket", "lapangan basket"],
-                "swimming_pool": ["kolam renang", "pool", "swimming"],
-                "gym": ["gym", "fitness", "fitnes"],
-                "playground": ["playground", "taman bermain", "area bermain"],
-                "tennis_court": ["tenis", "tennis", "lapangan tenis"],
-                "jogging_track": ["jogging", "joging", "lari"],
-                "security": ["security", "keamanan", "satpam"],
-                "cctv": ["cctv"],
-                "wifi": ["wifi", "wi-fi", "internet"],
-                "ac": ["ac", "air conditioner"],
-                "furnished": ["furnished", "perabot", "furnish"],
-                "garden": ["taman", "garden"],
-                "carport": ["carport", "garasi", "parkir"],
-            }
-
-            # Build keyword variations for matching
-            amenity_keywords = []
-            for a in amenities:
-                a_lower = a.lower()
-                # Add original and snake_case converted
-                amenity_keywords.append(a_lower)
-                amenity_keywords.append(a_lower.replace("_", " "))
-                # Add Indonesian mappings if available
-                if a_lower in amenity_id_mapping:
-                    amenity_keywords.extend(amenity_id_mapping[a_lower])
-
+            matches = _keyword_matcher(frozenset(amenity_keywords))
             filtered_results = []
             for doc, score in results:
-                doc_text = (doc.page_content or "").lower()
-                if any(kw in doc_text for kw in amenity_keywords):
+                doc_text = _lowered_page_content(doc)
+                if matches(doc_text):
                     filtered_results.append((doc, score))
 
             logger.info(
@@ -539,8 +1028,6 @@ class HybridSearchService:
             )
 
         # Build Property objects from ChromaDB metadata
-        from ..adapters.base import Property, PropertyType, ListingType
-
         properties = []
         semantic_scores = {}
         property_ids = []  # Collect IDs for URL enrichment
@@ -551,37 +1038,44 @@ class HybridSearchService:
             if not prop_id:
                 continue
 
-            # Map property_type string to enum
-            prop_type_str = meta.get("property_type", "house")
-            try:
-                prop_type = PropertyType(prop_type_str)
-            except ValueError:
-                prop_type = PropertyType.HOUSE
+            cached = _property_build_cache.get(prop_id)
+            if cached is None or cached[0] != meta.get("updated_at"):
+                # Map property_type string to enum
+                prop_type_str = meta.get("property_type", "house")
+                try:
+                    prop_type = PropertyType(prop_type_str)
+                except ValueError:
+                    prop_type = PropertyType.HOUSE
 
-            # Map listing_type string to enum
-            listing_type_str = meta.get("listing_type", "sale")
-            try:
-                listing_type = ListingType(listing_type_str)
-            except ValueError:
-                listing_type = ListingType.SALE
-
-            # Build minimal Property from metadata
-            prop = Property(
-                id=prop_id,
-                source="metaproperty",  # Required field
-                title=meta.get("title", "Unknown"),
-                property_type=prop_type,
-                listing_type=listing_type,
-                price=meta.get("price", 0),
-                location=meta.get("district", ""),
-                city=meta.get("city", ""),
-                bedrooms=meta.get("bedrooms"),
-                bathrooms=meta.get("bathrooms"),
-                land_area=meta.get("land_area"),
-                building_area=meta.get("building_area"),
-                source_type=meta.get("source", "listing"),
-                url_view=meta.get("url_view", ""),  # Will be enriched from API
-            )
+                # Map listing_type string to enum
+                listing_type_str = meta.get("listing_type", "sale")
+                try:
+                    listing_type = ListingType(listing_type_str)
+                except ValueError:
+                    listing_type = ListingType.SALE
+
+                # Build minimal Property from metadata
+                prop = Property(
+                    id=prop_id,
+                    source="metaproperty",  # Required field
+                    title=meta.get("title", "Unknown"),
+                    property_type=prop_type,
+                    listing_type=listing_type,
+                    price=meta.get("price", 0),
+                    location=meta.get("district", ""),
+                    city=meta.get("city", ""),
+                    bedrooms=meta.get("bedrooms"),
+                    bathrooms=meta.get("bathrooms"),
+                    land_area=meta.get("land_area"),
+                    building_area=meta.get("building_area"),
+                    source_type=meta.get("source", "listing"),
+                    url_view=meta.get("url_view", ""),  # Will be enriched from API
+                )
+                cached = (meta.get("updated_at"), prop)
+                _property_build_cache[prop_id] = cached
+
+            # Callers annotate results (url_view, relevance_score), so hand out a copy
+            prop = copy.copy(cached[1])
             properties.append(prop)
             property_ids.append(str(prop_id))
             # Score is already relevance score (higher = better) from similarity_search_by_vector_with_relevance_scores
@@ -593,7 +1087,7 @@ class HybridSearchService:
 
         # Enrich properties with URL from API (only if ChromaDB doesn't have url_view yet)
         # Once ChromaDB is re-synced with url_view/slug, this block will be skipped
-        if properties and adapter:
+        if properties and adapter and enrich_urls:
             # Find properties that need URL enrichment (don't have url_view from metadata)
             properties_need_url = {
                 str(prop.id): prop.source_type or "listing"
@@ -622,7 +1116,7 @@ class HybridSearchService:
             has_more=False,  # Semantic-only doesn't support pagination yet
         )
 
-    def _semantic_rerank(
+    async def _semantic_rerank(
         self,
         query: str,
         properties: List[Property],
@@ -630,10 +1124,11 @@ class HybridSearchService:
         semantic_weight: Optional[float] = None,
     ) -> dict:
         """
-        Re-rank properties using ChromaDB semantic similarity.
+        Re-rank properties by embedding similarity to the query.
         
         Strategy:
-        1. Get semantic scores from ChromaDB for each property
+        1. Score each property by cosine similarity between the query and
+           the property's embedding (cached per property)
         2. Combine with API order (position score)
         3. Sort by combined score
         
@@ -649,69 +1144,39 @@ class HybridSearchService:
         # Use provided weight or instance default
         weight = semantic_weight if semantic_weight is not None else self.semantic_weight
         
-        # Get property IDs
-        property_ids = [str(p.id) for p in properties]
-        
-        # Get semantic scores from ChromaDB
-        semantic_scores = {}
+        # Get semantic scores: exact cosine between the query and every API property
         try:
-            # Dynamic k based on API results - only fetch what we need
-            # Add small buffer for re-ranking flexibility
-            k_rerank = min(len(properties) + 5, 25)
-
-            # Get cached embedding for the query
-            query_embedding = get_cached_embedding(query, self.embeddings)
-
-            # Search ChromaDB with pre-computed embedding (uses cache)
-            results = self.property_store.vector_store.similarity_search_by_vector_with_relevance_scores(
-                embedding=query_embedding,
-                k=k_rerank,
+            query_embedding, doc_vecs = await asyncio.gather(
+                get_cached_embedding_async(query, self.embeddings),
+                get_property_vectors(properties, self.embeddings),
             )
-            
-            # Map property_id to relevance score (higher = better match)
-            for doc, score in results:
-                prop_id = doc.metadata.get("property_id")
-                if prop_id:
-                    # Score is already relevance score from similarity_search_by_vector_with_relevance_scores
-                    semantic_scores[str(prop_id)] = score
-                    
+            q = np.asarray(query_embedding, dtype=np.float32)
+            q /= np.linalg.norm(q) or 1.0
+            sem = (doc_vecs @ q).astype(np.float64)
+
         except Exception as e:
             logger.error("semantic_score_error", error=str(e), query=query)
             return {"properties": properties[:limit], "scores": {}}
         
-        # Calculate combined scores
-        scored_properties = []
-        for i, prop in enumerate(properties):
-            prop_id = str(prop.id)
-            
-            # API position score (earlier = better, normalize to 0-1)
-            api_score = 1.0 - (i / len(properties))
-            
-            # Semantic score (from ChromaDB, default to 0 if not found)
-            sem_score = semantic_scores.get(prop_id, 0.0)
-            
-            # Combined score using provided weight
-            combined = (
-                weight * sem_score +
-                (1 - weight) * api_score
-            )
-            
-            scored_properties.append({
-                "property": prop,
-                "api_score": api_score,
-                "semantic_score": sem_score,
-                "combined_score": combined,
-            })
-        
-        # Sort by combined score (descending)
-        scored_properties.sort(key=lambda x: x["combined_score"], reverse=True)
-        
+        # Combined score: semantic similarity blended with API position
+        # (earlier = better, normalized to 0-1)
+        n = len(properties)
+        api = 1.0 - np.arange(n) / n
+        combined = weight * sem + (1 - weight) * api
+
+        # Top `limit` by combined score, descending. Ties keep API order, so
+        # candidates are every index scoring at least the limit-th best value
+        # (found with argpartition) and are then stable-sorted
+        if 0 < limit < n:
+            kth = combined[np.argpartition(-combined, limit - 1)[limit - 1]]
+            candidates = np.flatnonzero(combined >= kth)
+        else:
+            candidates = np.arange(n)
+        top_idx = candidates[np.argsort(-combined[candidates], kind="stable")][:limit].tolist()
+
         # Build result
-        reranked_properties = [sp["property"] for sp in scored_properties[:limit]]
-        scores = {
-            str(sp["property"].id): sp["semantic_score"] 
-            for sp in scored_properties[:limit]
-        }
+        reranked_properties = [properties[i] for i in top_idx]
+        scores = {str(properties[i].id): float(sem[i]) for i in top_idx}
         
         return {
             "properties": reranked_properties,
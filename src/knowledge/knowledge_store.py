@@ -13,16 +13,21 @@ Usage:
 """
 
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 from datetime import datetime
+from functools import lru_cache
 
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
+from ._chroma import tune_sqlite
+from .hybrid_search import get_cached_embedding
+
 
 # Category mapping based on folder names
 CATEGORY_MAP = {
@@ -31,6 +36,23 @@ CATEGORY_MAP = {
     "motivational": "motivation",
 }
 
+# Split on markdown headings first, then paragraphs, lines and words
+MARKDOWN_SEPARATORS = ("\n## ", "\n### ", "\n\n", "\n", " ", "")
+
+
+@lru_cache(maxsize=8)
+def _get_text_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Optional[tuple[str, ...]] = None,
+) -> RecursiveCharacterTextSplitter:
+    """Splitter for a configuration, built once and reused (it holds no per-call state)."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=list(separators) if separators is not None else None,
+    )
+
 
 class KnowledgeStore:
     """
@@ -65,6 +87,7 @@ class KnowledgeStore:
                 collection_name=self.collection_name,
                 embedding_function=self.embeddings,
             )
+            tune_sqlite(self._vector_store)
         return self._vector_store
     
     def ingest_directory(
@@ -72,6 +95,7 @@ class KnowledgeStore:
         docs_dir: str = "data/knowledge-base",
         chunk_size: int = 500,
         chunk_overlap: int = 50,
+        batch_size: int = 200,
     ) -> int:
         """
         Ingest all markdown files from the knowledge base directory.
@@ -80,6 +104,7 @@ class KnowledgeStore:
             docs_dir: Root directory containing knowledge base folders
             chunk_size: Size of text chunks for embedding
             chunk_overlap: Overlap between chunks
+            batch_size: Chunks per add_documents call (ChromaDB suggests 50-250)
             
         Returns:
             Number of documents ingested
@@ -88,9 +113,8 @@ class KnowledgeStore:
         if not docs_path.exists():
             raise FileNotFoundError(f"Knowledge base directory not found: {docs_dir}")
         
-        all_documents: List[Document] = []
-        
-        # Process each category folder
+        # Collect (file, category, folder) for each category folder
+        tasks = []
         for folder in docs_path.iterdir():
             if not folder.is_dir():
                 continue
@@ -98,29 +122,35 @@ class KnowledgeStore:
             category = CATEGORY_MAP.get(folder.name, folder.name)
             print(f"Processing category: {category} ({folder.name})")
             
-            # Load markdown files from this category
             for md_file in folder.glob("*.md"):
                 print(f"  Loading: {md_file.name}")
-                
-                try:
-                    with open(md_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    
-                    # Create document with metadata
-                    doc = Document(
-                        page_content=content,
-                        metadata={
-                            "source": str(md_file.name),
-                            "category": category,
-                            "folder": folder.name,
-                            "full_path": str(md_file),
-                            "ingested_at": datetime.now().isoformat(),
-                        }
-                    )
-                    all_documents.append(doc)
-                    
-                except Exception as e:
-                    print(f"  Error loading {md_file}: {e}")
+                tasks.append((md_file, category, folder.name))
+
+        ingested_at = datetime.now().isoformat()
+
+        def load(task) -> Optional[Document]:
+            md_file, category, folder_name = task
+            try:
+                content = md_file.read_text(encoding="utf-8")
+            except Exception as e:
+                print(f"  Error loading {md_file}: {e}")
+                return None
+
+            # Create document with metadata
+            return Document(
+                page_content=content,
+                metadata={
+                    "source": str(md_file.name),
+                    "category": category,
+                    "folder": folder_name,
+                    "full_path": str(md_file),
+                    "ingested_at": ingested_at,
+                }
+            )
+
+        # Read files concurrently (I/O bound; the GIL is released during reads)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            all_documents: List[Document] = [doc for doc in executor.map(load, tasks) if doc is not None]
         
         if not all_documents:
             print("No documents found to ingest")
@@ -129,11 +159,7 @@ class KnowledgeStore:
         print(f"\nLoaded {len(all_documents)} documents")
         
         # Split into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=["\n## ", "\n### ", "\n\n", "\n", " ", ""],
-        )
+        text_splitter = _get_text_splitter(chunk_size, chunk_overlap, MARKDOWN_SEPARATORS)
         
         chunks = text_splitter.split_documents(all_documents)
         print(f"Split into {len(chunks)} chunks")
@@ -147,8 +173,19 @@ class KnowledgeStore:
         except Exception:
             pass  # Collection might not exist
         
-        # Add to vector store
-        self.vector_store.add_documents(chunks)
+        # Embed every chunk up front (OpenAIEmbeddings sends up to its
+        # chunk_size texts per request), then write in bounded batches
+        texts = [chunk.page_content for chunk in chunks]
+        vectors = self.embeddings.embed_documents(texts)
+        collection = self.vector_store._collection
+        for i in range(0, len(chunks), batch_size):
+            batch = slice(i, i + batch_size)
+            collection.add(
+                ids=[str(uuid.uuid4()) for _ in texts[batch]],
+                embeddings=vectors[batch],
+                documents=texts[batch],
+                metadatas=[chunk.metadata for chunk in chunks[batch]],
+            )
         print(f"Ingested {len(chunks)} chunks to ChromaDB")
         
         return len(chunks)
@@ -174,8 +211,8 @@ class KnowledgeStore:
         if category:
             filter_dict = {"category": category}
         
-        return self.vector_store.similarity_search(
-            query=query,
+        return self.vector_store.similarity_search_by_vector(
+            embedding=get_cached_embedding(query, self.embeddings),
             k=k,
             filter=filter_dict,
         )
@@ -191,8 +228,8 @@ class KnowledgeStore:
         if category:
             filter_dict = {"category": category}
         
-        return self.vector_store.similarity_search_with_score(
-            query=query,
+        return self.vector_store.similarity_search_by_vector_with_relevance_scores(
+            embedding=get_cached_embedding(query, self.embeddings),
             k=k,
             filter=filter_dict,
         )
@@ -202,13 +239,26 @@ class KnowledgeStore:
         collection = self.vector_store._collection
         count = collection.count()
         
-        # Count by category
+        # Count by category. Known categories are counted from ids only;
+        # metadata is loaded just for chunks in other (custom) categories
         categories = {}
         if count > 0:
-            results = collection.get(include=["metadatas"])
-            for meta in results.get("metadatas", []):
-                cat = meta.get("category", "unknown")
-                categories[cat] = categories.get(cat, 0) + 1
+            known = sorted(set(CATEGORY_MAP.values()))
+            for cat in known:
+                n = len(collection.get(where={"category": cat}, include=[])["ids"])
+                if n:
+                    categories[cat] = n
+
+            remaining = count - sum(categories.values())
+            if remaining:
+                results = collection.get(where={"category": {"$nin": known}}, include=["metadatas"])
+                for meta in results.get("metadatas", []):
+                    cat = meta.get("category", "unknown")
+                    categories[cat] = categories.get(cat, 0) + 1
+                    remaining -= 1
+                # Chunks without a category key match no where filter
+                if remaining > 0:
+                    categories["unknown"] = categories.get("unknown", 0) + remaining
         
         return {
             "total_chunks": count,
@@ -245,10 +295,7 @@ class KnowledgeStore:
         )
         
         # Split into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-        )
+        text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
         chunks = text_splitter.split_documents([doc])
         
         # Add to vector store
@@ -12,7 +12,10 @@ Usage:
     results = store.search("taman luas modern")
 """
 
+import asyncio
+import hashlib
 import os
+import re
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -21,6 +24,91 @@ from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 
+from ._chroma import tune_sqlite
+from .hybrid_search import get_cached_embedding
+
+
+# Documents per add_documents call in bulk upserts (ChromaDB suggests 50-250)
+DEFAULT_BATCH_SIZE = 200
+
+# HNSW graph parameters for newly created property collections. M=32 and
+# construction_ef=200 (Chroma defaults 16/100) give a better-connected graph,
+# so filtered queries reach good recall in fewer hops; the cost is roughly
+# twice the graph memory and slower index builds. Chroma fixes these when a
+# collection is created, so an existing store keeps its parameters until it
+# is cleared and re-synced.
+DEFAULT_HNSW_PARAMS = {
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+}
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Display labels used in document text
+_PROPERTY_TYPE_LABELS = {
+    "house": "Rumah",
+    "shophouse": "Ruko",
+    "land": "Tanah",
+    "apartment": "Apartemen",
+    "warehouse": "Gudang",
+    "office": "Kantor",
+    "villa": "Villa",
+    "perumahan": "Perumahan",
+}
+
+_CERTIFICATE_LABELS = {
+    "shm": "SHM (Sertifikat Hak Milik)",
+    "shgb": "SHGB (Sertifikat Hak Guna Bangunan)",
+    "hgb": "HGB",
+    "girik": "Girik",
+    "ppjb": "PPJB",
+}
+
+# Common amenity codes mapped to Indonesian (keys lowercase, looked up by a.lower())
+_AMENITY_LABELS = {
+    "electricity": "listrik",
+    "water": "air PDAM",
+    "furnished": "full furnished",
+    "semi_furnished": "semi furnished",
+    "unfurnished": "unfurnished",
+    "ceramic_floor": "lantai keramik",
+    "marble_floor": "lantai marmer",
+    "painted_walls": "dinding cat",
+    "ac": "AC",
+    "ac_installation": "instalasi AC",
+    "water_heater": "water heater",
+    "stair_railing": "railing tangga",
+    "security_24": "security 24 jam",
+    "swimming_pool": "kolam renang",
+    "playground": "playground",
+    "jogging_track": "jogging track",
+    "clubhouse": "clubhouse",
+    "garden": "taman",
+    "garage": "garasi",
+    "carport": "carport",
+}
+
+
+def _to_int(value) -> int:
+    return int(float(value))
+
+
+def _min_max(values: Optional[list], convert) -> tuple:
+    """(min, max) of the non-empty values after convert, in one pass; (0, 0) if none."""
+    lo = hi = None
+    for value in values or ():
+        if not value:
+            continue
+        value = convert(value)
+        if lo is None:
+            lo = hi = value
+        elif value < lo:
+            lo = value
+        elif value > hi:
+            hi = value
+    return (lo, hi) if lo is not None else (0, 0)
+
 
 class PropertyStore:
     """
@@ -46,8 +134,11 @@ class PropertyStore:
         collection_name: str = "properties",
         embedding_model: str = "text-embedding-3-small",
         use_model_suffix: bool = False,
+        hnsw_params: Optional[dict] = None,
     ):
         self.embedding_model = embedding_model
+        # {} keeps Chroma's own defaults
+        self.hnsw_params = DEFAULT_HNSW_PARAMS if hnsw_params is None else hnsw_params
 
         # Optionally include model name in directory for multi-model comparison
         if use_model_suffix:
@@ -71,9 +162,76 @@ class PropertyStore:
                 persist_directory=self.persist_dir,
                 collection_name=self.collection_name,
                 embedding_function=self.embeddings,
+                collection_metadata=self.hnsw_params or None,
             )
+            tune_sqlite(self._vector_store)
         return self._vector_store
+
+    @property
+    def collection(self):
+        """
+        The underlying chromadb Collection.
+
+        Reads and writes here go straight to chromadb with precomputed
+        embeddings; the langchain wrapper is only kept for the agent tools
+        that take a Chroma vector store.
+        """
+        return self.vector_store._collection
     
+    @staticmethod
+    def _project_text_parts(listing: dict) -> List[str]:
+        """Document text sections only projects have (developer, unit types, ranges)."""
+        parts = []
+        developer = listing.get("developer")
+        if developer:
+            parts.append(f"Proyek baru dari developer {developer}")
+        else:
+            parts.append("Proyek baru (primary market)")
+
+        # 3b. Unit types info for projects (enables "proyek 3 kamar", "3 lantai" queries)
+        unit_types = listing.get("unit_types") or []
+        if unit_types:
+            parts.append("Tipe unit tersedia: " + ", ".join(unit_types))
+
+        # Bedrooms available in project
+        bedrooms_avail = listing.get("bedrooms_available") or []
+        if bedrooms_avail:
+            if len(bedrooms_avail) == 1:
+                parts.append(f"Tersedia rumah {bedrooms_avail[0]} kamar tidur")
+            else:
+                parts.append(f"Tersedia rumah {min(bedrooms_avail)}-{max(bedrooms_avail)} kamar tidur")
+
+        # Floors available (handle string like "2.0")
+        floors_avail = listing.get("floors_available") or []
+        if floors_avail:
+            # Convert to int, handling float strings like "2.0"
+            floors_int = [int(float(f)) for f in floors_avail if f]
+            if floors_int:
+                if len(floors_int) == 1:
+                    parts.append(f"Bangunan {floors_int[0]} lantai")
+                else:
+                    parts.append(f"Bangunan {min(floors_int)}-{max(floors_int)} lantai")
+
+        # Building area range
+        ba_min = listing.get("building_area_min")
+        ba_max = listing.get("building_area_max")
+        if ba_min and ba_max:
+            if ba_min == ba_max:
+                parts.append(f"Luas bangunan {int(ba_min)}m²")
+            else:
+                parts.append(f"Luas bangunan {int(ba_min)}-{int(ba_max)}m²")
+
+        # Land area range
+        la_min = listing.get("land_area_min")
+        la_max = listing.get("land_area_max")
+        if la_min and la_max:
+            if la_min == la_max:
+                parts.append(f"Luas tanah {int(la_min)}m²")
+            else:
+                parts.append(f"Luas tanah {int(la_min)}-{int(la_max)}m²")
+
+        return parts
+
     def _create_document_text(self, listing: dict) -> str:
         """
         Create searchable text from listing data for semantic embedding.
@@ -100,53 +258,7 @@ class PropertyStore:
 
         # 3. Source type context (primary/secondary market)
         if source_type == "project":
-            developer = listing.get("developer")
-            if developer:
-                parts.append(f"Proyek baru dari developer {developer}")
-            else:
-                parts.append("Proyek baru (primary market)")
-
-            # 3b. Unit types info for projects (enables "proyek 3 kamar", "3 lantai" queries)
-            unit_types = listing.get("unit_types") or []
-            if unit_types:
-                parts.append("Tipe unit tersedia: " + ", ".join(unit_types))
-
-            # Bedrooms available in project
-            bedrooms_avail = listing.get("bedrooms_available") or []
-            if bedrooms_avail:
-                if len(bedrooms_avail) == 1:
-                    parts.append(f"Tersedia rumah {bedrooms_avail[0]} kamar tidur")
-                else:
-                    parts.append(f"Tersedia rumah {min(bedrooms_avail)}-{max(bedrooms_avail)} kamar tidur")
-
-            # Floors available (handle string like "2.0")
-            floors_avail = listing.get("floors_available") or []
-            if floors_avail:
-                # Convert to int, handling float strings like "2.0"
-                floors_int = [int(float(f)) for f in floors_avail if f]
-                if floors_int:
-                    if len(floors_int) == 1:
-                        parts.append(f"Bangunan {floors_int[0]} lantai")
-                    else:
-                        parts.append(f"Bangunan {min(floors_int)}-{max(floors_int)} lantai")
-
-            # Building area range
-            ba_min = listing.get("building_area_min")
-            ba_max = listing.get("building_area_max")
-            if ba_min and ba_max:
-                if ba_min == ba_max:
-                    parts.append(f"Luas bangunan {int(ba_min)}m²")
-                else:
-                    parts.append(f"Luas bangunan {int(ba_min)}-{int(ba_max)}m²")
-
-            # Land area range
-            la_min = listing.get("land_area_min")
-            la_max = listing.get("land_area_max")
-            if la_min and la_max:
-                if la_min == la_max:
-                    parts.append(f"Luas tanah {int(la_min)}m²")
-                else:
-                    parts.append(f"Luas tanah {int(la_min)}-{int(la_max)}m²")
+            parts.extend(self._project_text_parts(listing))
 
         # 4. Description or additional_info (main content)
         description = listing.get("description")
@@ -154,9 +266,8 @@ class PropertyStore:
 
         if description:
             # Strip HTML tags if present
-            import re
-            clean_desc = re.sub(r'<[^>]+>', ' ', str(description))
-            clean_desc = re.sub(r'\s+', ' ', clean_desc).strip()
+            clean_desc = _HTML_TAG_RE.sub(' ', str(description))
+            clean_desc = _WHITESPACE_RE.sub(' ', clean_desc).strip()
             if clean_desc:
                 parts.append(clean_desc)
 
@@ -180,78 +291,38 @@ class PropertyStore:
 
         # 6. Property type
         if listing.get("property_type"):
-            type_map = {
-                "house": "Rumah",
-                "shophouse": "Ruko",
-                "land": "Tanah",
-                "apartment": "Apartemen",
-                "warehouse": "Gudang",
-                "office": "Kantor",
-                "villa": "Villa",
-                "perumahan": "Perumahan",
-            }
             prop_type = listing["property_type"]
-            parts.append(f"Tipe: {type_map.get(prop_type, prop_type)}")
+            parts.append(f"Tipe: {_PROPERTY_TYPE_LABELS.get(prop_type, prop_type)}")
 
         # 7. Certificate type (important for buyers)
         if listing.get("certificate_type"):
-            cert_map = {
-                "shm": "SHM (Sertifikat Hak Milik)",
-                "shgb": "SHGB (Sertifikat Hak Guna Bangunan)",
-                "hgb": "HGB",
-                "girik": "Girik",
-                "ppjb": "PPJB",
-            }
             cert = listing["certificate_type"]
-            parts.append(f"Sertifikat: {cert_map.get(cert.lower(), cert.upper())}")
+            parts.append(f"Sertifikat: {_CERTIFICATE_LABELS.get(cert.lower(), cert.upper())}")
 
         # 8. Amenities/Facilities (key differentiator for semantic search!)
         amenities = listing.get("amenities") or listing.get("facilities") or []
         if amenities and isinstance(amenities, list):
-            # Map common amenity codes to Indonesian
-            amenity_map = {
-                "electricity": "listrik",
-                "water": "air PDAM",
-                "furnished": "full furnished",
-                "semi_furnished": "semi furnished",
-                "unfurnished": "unfurnished",
-                "ceramic_floor": "lantai keramik",
-                "marble_floor": "lantai marmer",
-                "painted_walls": "dinding cat",
-                "ac": "AC",
-                "ac_installation": "instalasi AC",
-                "water_heater": "water heater",
-                "stair_railing": "railing tangga",
-                "security_24": "security 24 jam",
-                "swimming_pool": "kolam renang",
-                "playground": "playground",
-                "jogging_track": "jogging track",
-                "clubhouse": "clubhouse",
-                "garden": "taman",
-                "garage": "garasi",
-                "carport": "carport",
-            }
-
-            readable_amenities = []
-            for a in amenities:
-                if isinstance(a, str):
-                    readable = amenity_map.get(a.lower(), a.replace("_", " "))
-                    readable_amenities.append(readable)
-
+            readable_amenities = [
+                _AMENITY_LABELS.get(a.lower(), a.replace("_", " "))
+                for a in amenities
+                if isinstance(a, str)
+            ]
             if readable_amenities:
                 parts.append("Fasilitas: " + ", ".join(readable_amenities))
 
         return "\n\n".join(parts)
     
-    def upsert_property(self, listing: dict) -> bool:
+    def _build_document(self, listing: dict, synced_at: Optional[str] = None) -> tuple[str, Document]:
         """
-        Add or update a single property in the vector store.
-        
+        Build the ChromaDB document (text + filter metadata) for a listing.
+
         Args:
-            listing: Property data dict with id, title, description, etc.
-            
+            listing: Property data dict
+            synced_at: ISO timestamp to record; bulk upserts pass one shared
+                value. Defaults to now.
+
         Returns:
-            True if successful
+            (property_id, Document) tuple
         """
         property_id = str(listing.get("id") or listing.get("slug"))
         if not property_id:
@@ -266,21 +337,10 @@ class PropertyStore:
 
         # For projects, use range data from unit types
         if source == "project":
-            bedrooms_avail = listing.get("bedrooms_available") or []
-            bathrooms_avail = listing.get("bathrooms_available") or []
-            floors_avail = listing.get("floors_available") or []
-
-            # Convert to int/float, handling string values like "2.0"
-            bedrooms_avail = [int(float(x)) for x in bedrooms_avail if x] if bedrooms_avail else []
-            bathrooms_avail = [int(float(x)) for x in bathrooms_avail if x] if bathrooms_avail else []
-            floors_avail = [float(x) for x in floors_avail if x] if floors_avail else []
-
-            bedrooms_min = min(bedrooms_avail) if bedrooms_avail else 0
-            bedrooms_max = max(bedrooms_avail) if bedrooms_avail else 0
-            bathrooms_min = min(bathrooms_avail) if bathrooms_avail else 0
-            bathrooms_max = max(bathrooms_avail) if bathrooms_avail else 0
-            floors_min = min(floors_avail) if floors_avail else 0
-            floors_max = max(floors_avail) if floors_avail else 0
+            # Values may be strings like "2.0"; blanks are skipped
+            bedrooms_min, bedrooms_max = _min_max(listing.get("bedrooms_available"), _to_int)
+            bathrooms_min, bathrooms_max = _min_max(listing.get("bathrooms_available"), _to_int)
+            floors_min, floors_max = _min_max(listing.get("floors_available"), float)
 
             land_area_min = float(listing.get("land_area_min", 0) or 0)
             land_area_max = float(listing.get("land_area_max", 0) or 0)
@@ -337,41 +397,180 @@ class PropertyStore:
             "complex_name": complex_name,  # For in_complex filter
             "in_complex": 1 if complex_name else 0,  # 1=in complex, 0=standalone (for filtering)
             "facing": facing.lower() if facing else "",  # Facing direction (utara, selatan, etc.)
-            "synced_at": datetime.now().isoformat(),
+            "synced_at": synced_at or datetime.now().isoformat(),
+            # Lets re-syncs reuse the stored embedding when the text is unchanged
+            "content_hash": self._content_hash(doc_text),
         }
+
+        return property_id, Document(page_content=doc_text, metadata=metadata)
+
+    def upsert_property(self, listing: dict) -> bool:
+        """
+        Add or update a single property in the vector store.
         
-        # Remove existing document with same ID
-        try:
-            self.vector_store._collection.delete(ids=[property_id])
-        except Exception:
-            pass  # Document might not exist
-        
-        # Add new document
-        doc = Document(page_content=doc_text, metadata=metadata)
-        self.vector_store.add_documents([doc], ids=[property_id])
+        Args:
+            listing: Property data dict with id, title, description, etc.
+            
+        Returns:
+            True if successful
+        """
+        property_id, doc = self._build_document(listing)
+
+        # Add new document or replace the existing one with the same ID
+        vectors = self._embed_documents([property_id], [doc])
+        self._upsert_embedded([property_id], [doc], vectors)
         
         return True
     
-    def upsert_many(self, listings: List[dict]) -> int:
+    def _content_hash(self, doc_text: str) -> str:
+        """Hash of the embedded text and the model that embeds it."""
+        return hashlib.sha256(f"{self.embedding_model}\0{doc_text}".encode()).hexdigest()
+
+    def _embed_documents(self, ids: List[str], docs: List[Document]) -> list:
+        """
+        Embeddings for documents, reusing stored vectors where the text is unchanged.
+
+        Metadata (price, status, ...) is still rewritten on upsert; only the
+        embedding API call is skipped for documents whose content_hash
+        matches the one already in the collection.
+        """
+        stored = {}
+        try:
+            existing = self.collection.get(ids=ids, include=["metadatas", "embeddings"])
+            for pid, meta, vector in zip(existing["ids"], existing["metadatas"], existing["embeddings"]):
+                if meta and meta.get("content_hash"):
+                    stored[pid] = (meta["content_hash"], vector)
+        except Exception:
+            pass  # Fall back to embedding everything
+
+        vectors: list = [None] * len(ids)
+        missing = []
+        for i, (pid, doc) in enumerate(zip(ids, docs)):
+            content_hash, vector = stored.get(pid, (None, None))
+            if content_hash == doc.metadata["content_hash"]:
+                # Chroma returns stored vectors as ndarrays but rejects a write
+                # that mixes them with the embedder's lists, so reuse as lists
+                vectors[i] = vector.tolist() if hasattr(vector, "tolist") else list(vector)
+            else:
+                missing.append(i)
+
+        if missing:
+            embedded = self.embeddings.embed_documents([docs[i].page_content for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+        return vectors
+
+    def _upsert_embedded(self, ids: List[str], docs: List[Document], vectors: List[List[float]]) -> None:
+        """Add or replace documents using precomputed embeddings (one Chroma transaction)."""
+        self.collection.upsert(
+            ids=ids,
+            embeddings=vectors,
+            documents=[doc.page_content for doc in docs],
+            metadatas=[doc.metadata for doc in docs],
+        )
+
+    def _build_documents(self, listings: List[dict]) -> tuple[List[str], List[Document]]:
+        """Build documents for a bulk upsert, skipping (and reporting) bad listings."""
+        # A listing repeated in the input keeps its last version, as with
+        # sequential upserts (Chroma rejects duplicate ids in one write)
+        built: Dict[str, Document] = {}
+        synced_at = datetime.now().isoformat()
+        for listing in listings:
+            try:
+                property_id, doc = self._build_document(listing, synced_at)
+            except Exception as e:
+                print(f"Error upserting {listing.get('id')}: {e}")
+                continue
+            built.pop(property_id, None)
+            built[property_id] = doc
+        return list(built), list(built.values())
+
+    def _write_batch(self, ids: List[str], docs: List[Document], vectors: list) -> int:
+        """Upsert one batch; on failure retry one by one. Returns documents written."""
+        try:
+            self._upsert_embedded(ids, docs, vectors)
+            return len(ids)
+        except Exception as e:
+            print(f"Error upserting batch of {len(ids)}, retrying one by one: {e}")
+
+        count = 0
+        for property_id, doc, vector in zip(ids, docs, vectors):
+            try:
+                self._upsert_embedded([property_id], [doc], [vector])
+                count += 1
+            except Exception as e:
+                print(f"Error upserting {property_id}: {e}")
+        return count
+
+    def upsert_many(self, listings: List[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
         """
         Bulk upsert multiple properties.
+
+        Documents whose text changed (or that are new) are embedded with one
+        embed_documents call (OpenAIEmbeddings sends up to its chunk_size
+        texts per request); unchanged ones keep their stored vectors. All are
+        then upserted into ChromaDB batch_size at a time with those vectors.
+        If a batch fails, its listings are retried one by one with the same
+        vectors, so a single bad listing doesn't drop the rest.
         
         Returns:
-            Number of properties upserted
+            Number of distinct properties upserted
         """
+        ids, docs = self._build_documents(listings)
+        if not ids:
+            return 0
+
+        try:
+            vectors = self._embed_documents(ids, docs)
+        except Exception as e:
+            print(f"Error embedding {len(docs)} properties: {e}")
+            return 0
+
         count = 0
-        for listing in listings:
+        for i in range(0, len(ids), batch_size):
+            batch = slice(i, i + batch_size)
+            count += self._write_batch(ids[batch], docs[batch], vectors[batch])
+        return count
+
+    async def upsert_many_async(self, listings: List[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Bulk upsert that overlaps embedding with ChromaDB writes.
+
+        Works batch by batch: while one batch is written to ChromaDB (in a
+        worker thread), the next batch is being embedded, so at most one
+        embedding request and one write are in flight. Same error handling
+        and embedding reuse as upsert_many; a batch whose embedding fails
+        is reported and skipped.
+
+        Returns:
+            Number of distinct properties upserted
+        """
+        ids, docs = self._build_documents(listings)
+
+        count = 0
+        write_task: Optional[asyncio.Task] = None
+        for i in range(0, len(ids), batch_size):
+            batch_ids, batch_docs = ids[i:i + batch_size], docs[i:i + batch_size]
             try:
-                self.upsert_property(listing)
-                count += 1
+                vectors = await asyncio.to_thread(self._embed_documents, batch_ids, batch_docs)
             except Exception as e:
-                print(f"Error upserting {listing.get('id')}: {e}")
+                print(f"Error embedding {len(batch_docs)} properties: {e}")
+                continue
+
+            if write_task is not None:
+                count += await write_task
+            write_task = asyncio.create_task(
+                asyncio.to_thread(self._write_batch, batch_ids, batch_docs, vectors)
+            )
+
+        if write_task is not None:
+            count += await write_task
         return count
     
     def delete_property(self, property_id: str) -> bool:
         """Delete a property from the vector store"""
         try:
-            self.vector_store._collection.delete(ids=[str(property_id)])
+            self.collection.delete(ids=[str(property_id)])
             return True
         except Exception:
             return False
@@ -395,22 +594,31 @@ class PropertyStore:
         Returns:
             List of property IDs ranked by semantic relevance
         """
-        # Build filter
-        filter_dict = {}
+        # Build filter. Chroma resolves the where clause to the allowed ids
+        # before the vector search, so narrow filters don't need a larger k.
+        # More than one condition has to be wrapped in $and
+        conditions = []
         if property_type:
-            filter_dict["property_type"] = property_type
+            conditions.append({"property_type": property_type})
         if city:
-            filter_dict["city"] = city
+            conditions.append({"city": city})
+        filter_dict = None
+        if len(conditions) == 1:
+            filter_dict = conditions[0]
+        elif len(conditions) > 1:
+            filter_dict = {"$and": conditions}
         
-        # Search
-        results = self.vector_store.similarity_search(
-            query=query,
-            k=k,
-            filter=filter_dict if filter_dict else None,
+        # Search (query embedding comes from the shared embedding cache).
+        # Only metadata is fetched; the document text isn't needed for IDs
+        results = self.collection.query(
+            query_embeddings=[get_cached_embedding(query, self.embeddings)],
+            n_results=k,
+            where=filter_dict,
+            include=["metadatas"],
         )
         
         # Return property IDs in ranked order
-        return [doc.metadata.get("property_id") for doc in results]
+        return [meta.get("property_id") for meta in results["metadatas"][0]]
     
     def search_with_scores(
         self,
@@ -423,19 +631,20 @@ class PropertyStore:
         Returns:
             List of (property_id, score) tuples
         """
-        results = self.vector_store.similarity_search_with_score(
-            query=query,
-            k=k,
+        results = self.collection.query(
+            query_embeddings=[get_cached_embedding(query, self.embeddings)],
+            n_results=k,
+            include=["metadatas", "distances"],
         )
         
         return [
-            (doc.metadata.get("property_id"), score)
-            for doc, score in results
+            (meta.get("property_id"), score)
+            for meta, score in zip(results["metadatas"][0], results["distances"][0])
         ]
     
     def get_stats(self) -> dict:
         """Get collection statistics"""
-        collection = self.vector_store._collection
+        collection = self.collection
         count = collection.count()
 
         return {
@@ -3,17 +3,22 @@ Database models for Long-Term Memory System
 Stores client profiles, conversation history, and learned preferences
 """
 
-from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, DateTime, Text, JSON,
-    ForeignKey, Index, create_engine
+    ForeignKey, Index, create_engine, func
 )
-from sqlalchemy.orm import DeclarativeBase, relationship, sessionmaker
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import DeclarativeBase, deferred, relationship, sessionmaker
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 
 
+# Timestamps are naive UTC. Computed by the database, so inserts (including
+# bulk ones) don't send a Python-side value per row; timezone('UTC', now())
+# keeps them UTC whatever the session time zone is.
+_UTC_NOW = func.timezone("UTC", func.now())
+
+
 class Base(DeclarativeBase):
     """Base class for all models"""
     pass
@@ -31,10 +36,12 @@ class ClientProfile(Base):
     name = Column(String(100))
     
     # Learned Preferences (extracted from conversations)
-    preferred_locations = Column(JSON, default=list)  # ["Sunggal", "Medan Selayang"]
-    budget_range = Column(JSON)  # {"min": 500000000, "max": 1500000000}
-    preferred_property_types = Column(JSON, default=list)  # ["rumah", "ruko"]
-    preferred_features = Column(JSON, default=list)  # ["3KT", "garasi", "dekat sekolah"]
+    # JSONB so containment queries (preferred_locations @> '["Sunggal"]') can
+    # use the GIN indexes below
+    preferred_locations = Column(JSONB, default=list)  # ["Sunggal", "Medan Selayang"]
+    budget_range = Column(JSONB)  # {"min": 500000000, "max": 1500000000}
+    preferred_property_types = Column(JSONB, default=list)  # ["rumah", "ruko"]
+    preferred_features = Column(JSONB, default=list)  # ["3KT", "garasi", "dekat sekolah"]
     
     # Profile Data
     role = Column(String(20))  # "buyer", "seller", "agent"
@@ -46,8 +53,8 @@ class ClientProfile(Base):
     last_active_at = Column(DateTime)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
+    updated_at = Column(DateTime, server_default=_UTC_NOW, onupdate=_UTC_NOW)
     
     # Relationships
     conversations = relationship("ConversationSummary", back_populates="client")
@@ -55,6 +62,23 @@ class ClientProfile(Base):
     __table_args__ = (
         Index("ix_client_role", "role"),
         Index("ix_client_last_active", "last_active_at"),
+        # jsonb_path_ops only supports @>, but is much smaller and faster
+        # than the default jsonb_ops for it
+        Index(
+            "ix_client_locations_gin", "preferred_locations",
+            postgresql_using="gin",
+            postgresql_ops={"preferred_locations": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_client_property_types_gin", "preferred_property_types",
+            postgresql_using="gin",
+            postgresql_ops={"preferred_property_types": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_client_features_gin", "preferred_features",
+            postgresql_using="gin",
+            postgresql_ops={"preferred_features": "jsonb_path_ops"},
+        ),
     )
 
 
@@ -72,7 +96,8 @@ class ConversationSummary(Base):
     # Conversation Summary
     summary = Column(Text, nullable=False)  # LLM-generated summary
     key_topics = Column(JSON, default=list)  # ["pencarian rumah", "negosiasi harga"]
-    entities_mentioned = Column(JSON, default=list)  # Property IDs, locations, etc.
+    # Deferred: not needed for LLM context, loaded on first access
+    entities_mentioned = deferred(Column(JSON, default=list))  # Property IDs, locations, etc.
     
     # Intent & Outcome
     primary_intent = Column(String(50))  # "property_search", "coaching", etc.
@@ -85,15 +110,15 @@ class ConversationSummary(Base):
     # Timestamps
     started_at = Column(DateTime, nullable=False)
     ended_at = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
     
     # Relationships
     client = relationship("ClientProfile", back_populates="conversations")
     
     __table_args__ = (
-        Index("ix_conv_client_id", "client_id"),
+        # A client's recent conversations (client_id = ? ORDER BY started_at DESC)
+        Index("ix_conv_client_started", "client_id", "started_at"),
         Index("ix_conv_session_id", "session_id"),
-        Index("ix_conv_started_at", "started_at"),
     )
 
 
@@ -120,7 +145,7 @@ class PropertyInteraction(Base):
     feedback_reason = Column(Text)  # "terlalu mahal", "lokasi tidak cocok"
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
     
     __table_args__ = (
         Index("ix_prop_int_client_id", "client_id"),
@@ -136,47 +161,67 @@ class AgentMetrics(Base):
     """
     __tablename__ = "agent_metrics"
     
+    # Columns are declared (and so stored) fixed-width first, widest
+    # alignment first, with variable-length text last; this keeps
+    # PostgreSQL from padding between columns in every row
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
-    # Request Info
-    session_id = Column(String(100), nullable=False)
-    request_id = Column(String(100), nullable=False, unique=True)
-    
-    # Input
-    user_message = Column(Text, nullable=False)
-    detected_intent = Column(String(50))
-    actual_intent = Column(String(50))  # For labeled test data
+    # Metadata
+    created_at = Column(DateTime, server_default=_UTC_NOW)
     
-    # Routing
-    routed_to = Column(String(50))  # "property_agent", "coach_agent", etc.
+    # Cost
+    estimated_cost_usd = Column(Float)
     
-    # Response
-    response = Column(Text)
-    response_tokens = Column(Integer)
+    # Quality (for evaluation)
+    relevance_score = Column(Float)  # 0-5, manual or LLM-judged
     
     # Performance
     total_latency_ms = Column(Integer)  # Total response time
     llm_latency_ms = Column(Integer)  # Time in LLM calls
     retrieval_latency_ms = Column(Integer)  # Time in vector search
     
-    # Cost
+    # Tokens
     input_tokens = Column(Integer)
     output_tokens = Column(Integer)
-    estimated_cost_usd = Column(Float)
+    response_tokens = Column(Integer)
     
-    # Quality (for evaluation)
-    relevance_score = Column(Float)  # 0-5, manual or LLM-judged
     is_correct = Column(Boolean)  # For test cases with known answers
+    
+    # Request Info
+    session_id = Column(String(100), nullable=False)
+    request_id = Column(String(100), nullable=False, unique=True)
+    
+    # Intent & Routing
+    detected_intent = Column(String(50))
+    actual_intent = Column(String(50))  # For labeled test data
+    routed_to = Column(String(50))  # "property_agent", "coach_agent", etc.
     error_type = Column(String(50))  # If failed, what kind of error
     
-    # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Input / Response
+    # Deferred: metrics queries mostly read the numeric columns; use
+    # undefer() when the texts are needed for many rows
+    user_message = deferred(Column(Text, nullable=False))
+    response = deferred(Column(Text))
     
     __table_args__ = (
-        Index("ix_metrics_session", "session_id"),
-        Index("ix_metrics_intent", "detected_intent"),
-        Index("ix_metrics_routed_to", "routed_to"),
-        Index("ix_metrics_created", "created_at"),
+        # Composite (filter column, created_at) indexes serve both the filter
+        # and the ORDER BY / date range in one seek, e.g. a session's metrics
+        # in order or one agent's requests over a period
+        Index("ix_metrics_session_created", "session_id", "created_at"),
+        Index("ix_metrics_intent_created", "detected_intent", "created_at"),
+        Index(
+            "ix_metrics_routed_created", "routed_to", "created_at",
+            # Lets per-agent latency/token aggregates be index-only scans
+            postgresql_include=["response_tokens", "total_latency_ms"],
+        ),
+        # Rows are append-only in created_at order, so a BRIN index (min/max
+        # per block range) covers date-range scans at a tiny fraction of a
+        # B-tree's size
+        Index(
+            "ix_metrics_created_brin", "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
     )
 
 
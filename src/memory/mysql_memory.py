@@ -5,8 +5,14 @@ Persistent chat history storage using MetaProperty MySQL API.
 Provides sliding window for token efficiency while keeping full history.
 """
 
+import asyncio
+import hashlib
+import threading
+import weakref
 import httpx
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from langchain_core.messages import (
     BaseMessage,
@@ -16,6 +22,16 @@ from langchain_core.messages import (
     ToolMessage,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+from ..utils.logging import get_logger
+
+# Module logger
+logger = get_logger("rag.memory")
+
 
 @dataclass
 class ChatMemoryConfig:
@@ -24,6 +40,181 @@ class ChatMemoryConfig:
     api_token: str
     max_messages: int = 20  # Max messages to load for context
     timeout: float = 30.0
+    cache_size: int = 512  # Contexts kept for ETag revalidation (process-wide LRU)
+
+
+# Keep-alive clients shared by every MySQLChatMemory in the process, keyed by
+# (API URL, token hash, timeout), so memories created per request reuse warm
+# connections instead of paying DNS + TLS setup again. httpx.Client is
+# thread-safe.
+_clients: Dict[Tuple[str, str, float], httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+# Async clients, same keys, per event loop: an httpx.AsyncClient's pooled
+# connections belong to the loop that opened them, so a client is never
+# handed to another loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str, float], httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_clients_lock = threading.Lock()
+
+# Context windows shared by every MySQLChatMemory in the process:
+# (client key, thread_id, limit) -> (ETag, messages), most recently used last.
+# Revalidated with If-None-Match, so a 304 skips the download and parsing;
+# this process's own writes drop the thread's entries.
+_ContextKey = Tuple[Tuple[str, str, float], str, int]
+_context_cache: "OrderedDict[_ContextKey, Tuple[str, List[BaseMessage]]]" = OrderedDict()
+_context_cache_lock = threading.Lock()
+
+_CLIENT_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60,
+)
+
+
+def _client_key(config: ChatMemoryConfig) -> Tuple[str, str, float]:
+    token_hash = hashlib.sha256(config.api_token.encode()).hexdigest()
+    return (config.api_url, token_hash, config.timeout)
+
+
+def _client_kwargs(config: ChatMemoryConfig) -> Dict[str, Any]:
+    return {
+        "base_url": config.api_url,
+        "headers": {
+            "Authorization": f"Bearer {config.api_token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        },
+        "timeout": config.timeout,
+    }
+
+
+def _get_client(config: ChatMemoryConfig) -> httpx.Client:
+    key = _client_key(config)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                **_client_kwargs(config),
+                # retries only covers failed connection attempts, so a POST
+                # is never sent twice
+                transport=httpx.HTTPTransport(retries=2, limits=_CLIENT_LIMITS),
+            )
+            _clients[key] = client
+        return client
+
+
+def _get_async_client(config: ChatMemoryConfig) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        # Open connections reference their loop, so a closed loop's clients
+        # would otherwise keep it alive; drop them and let their sockets go
+        for dead in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[dead]
+        clients = _async_clients.setdefault(loop, {})
+    # Only this loop's thread touches its own dict
+    key = _client_key(config)
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = clients[key] = httpx.AsyncClient(
+            **_client_kwargs(config),
+            transport=httpx.AsyncHTTPTransport(retries=2, limits=_CLIENT_LIMITS),
+        )
+    return client
+
+
+def close_clients() -> None:
+    """Close the shared chat memory HTTP clients (call on app shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_clients() -> None:
+    """Close the shared async chat memory clients of the running event loop."""
+    with _async_clients_lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+# API role -> LangChain message class
+_ROLE_TO_MESSAGE = {
+    "system": SystemMessage,
+    "user": HumanMessage,
+    "assistant": AIMessage,
+    "tool": ToolMessage,
+}
+
+
+def _encode_system(msg: BaseMessage) -> Dict:
+    return {"content": msg.content, "role": "system"}
+
+
+def _encode_user(msg: BaseMessage) -> Dict:
+    return {"content": msg.content, "role": "user"}
+
+
+def _encode_assistant(msg: BaseMessage) -> Dict:
+    data = {"content": msg.content, "role": "assistant"}
+    tool_calls = getattr(msg, "tool_calls", None)
+    if tool_calls:
+        data["tool_calls"] = tool_calls
+    return data
+
+
+def _encode_tool(msg: BaseMessage) -> Dict:
+    return {
+        "content": msg.content,
+        "role": "tool",
+        "tool_call_id": msg.tool_call_id,
+        "tool_name": msg.name,
+    }
+
+
+def _encode_unknown(msg: BaseMessage) -> Dict:
+    return {"content": msg.content}
+
+
+# LangChain message class -> API dict encoder
+_ENCODERS: Dict[type, Callable[[BaseMessage], Dict]] = {
+    SystemMessage: _encode_system,
+    HumanMessage: _encode_user,
+    AIMessage: _encode_assistant,
+    ToolMessage: _encode_tool,
+}
+
+
+def _message_encoder(cls: type) -> Callable[[BaseMessage], Dict]:
+    """Encoder for a message class; subclasses (e.g. AIMessageChunk) resolve once"""
+    try:
+        return _ENCODERS[cls]
+    except KeyError:
+        encoder = next(
+            (enc for base, enc in list(_ENCODERS.items())
+             if enc is not _encode_unknown and issubclass(cls, base)),
+            _encode_unknown,
+        )
+        _ENCODERS[cls] = encoder
+        return encoder
+
+
+def _json_body(payload: Any) -> Dict[str, Any]:
+    """Request kwargs for a JSON body, encoded with orjson when it is installed"""
+    if orjson is not None:
+        return {"content": orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)}
+    return {"json": payload}
+
+
+def _parse_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 
 class MySQLChatMemory:
@@ -50,26 +241,22 @@ class MySQLChatMemory:
     def __init__(self, config: ChatMemoryConfig):
         self.config = config
         self._client: Optional[httpx.Client] = None
+        self._client_key = _client_key(config)
     
     @property
     def client(self) -> httpx.Client:
-        if self._client is None:
-            self._client = httpx.Client(
-                base_url=self.config.api_url,
-                headers={
-                    "Authorization": f"Bearer {self.config.api_token}",
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                },
-                timeout=self.config.timeout,
-            )
+        if self._client is None or self._client.is_closed:
+            self._client = _get_client(self.config)
         return self._client
     
+    @property
+    def aclient(self) -> httpx.AsyncClient:
+        """Shared async client for the running event loop"""
+        return _get_async_client(self.config)
+    
     def close(self):
-        """Close HTTP client"""
-        if self._client:
-            self._client.close()
-            self._client = None
+        """Release the HTTP client (the shared connection pool stays open)"""
+        self._client = None
     
     def get_context_messages(
         self, 
@@ -89,48 +276,124 @@ class MySQLChatMemory:
             List of LangChain BaseMessage objects
         """
         limit = limit or self.config.max_messages
+        key = (self._client_key, thread_id, limit)
+        with _context_cache_lock:
+            cached = _context_cache.get(key)
         
         try:
             response = self.client.get(
                 f"/api/v1/chat/conversations/{thread_id}/messages",
                 params={"limit": limit},
+                headers={"If-None-Match": cached[0]} if cached else None,
             )
+            return self._context_from_response(key, cached, response)
             
-            if response.status_code == 404:
-                return []
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            messages = []
-            for msg in data.get("data", []):
-                lc_msg = self._to_langchain_message(msg)
-                if lc_msg:
-                    messages.append(lc_msg)
-            
-            return messages
+        except httpx.HTTPError as e:
+            logger.warning("chat_memory_fetch_failed", thread_id=thread_id, error=str(e))
+            return []
+    
+    async def get_context_messages_async(
+        self,
+        thread_id: str,
+        limit: Optional[int] = None
+    ) -> List[BaseMessage]:
+        """Async get_context_messages, for callers running on an event loop"""
+        limit = limit or self.config.max_messages
+        key = (self._client_key, thread_id, limit)
+        with _context_cache_lock:
+            cached = _context_cache.get(key)
+        
+        try:
+            response = await self.aclient.get(
+                f"/api/v1/chat/conversations/{thread_id}/messages",
+                params={"limit": limit},
+                headers={"If-None-Match": cached[0]} if cached else None,
+            )
+            return self._context_from_response(key, cached, response)
             
         except httpx.HTTPError as e:
-            print(f"Error fetching messages: {e}")
+            logger.warning("chat_memory_fetch_failed", thread_id=thread_id, error=str(e))
             return []
     
+    def _context_from_response(
+        self,
+        key: _ContextKey,
+        cached: Optional[Tuple[str, List[BaseMessage]]],
+        response: httpx.Response,
+    ) -> List[BaseMessage]:
+        """Messages from a context response, updating the ETag cache"""
+        if response.status_code == 304 and cached:
+            # Re-insert: a concurrent write or eviction may have dropped the
+            # entry while the request was in flight
+            self._remember_context(key, cached)
+            return list(cached[1])
+        
+        if response.status_code == 404:
+            with _context_cache_lock:
+                _context_cache.pop(key, None)
+            return []
+        
+        response.raise_for_status()
+        data = _parse_json(response)
+        
+        messages = []
+        for msg in data.get("data", []):
+            lc_msg = self._to_langchain_message(msg)
+            if lc_msg:
+                messages.append(lc_msg)
+        
+        etag = response.headers.get("ETag")
+        if etag:
+            self._remember_context(key, (etag, messages))
+            return list(messages)
+        with _context_cache_lock:
+            _context_cache.pop(key, None)
+        return messages
+    
+    def _remember_context(
+        self,
+        key: _ContextKey,
+        entry: Tuple[str, List[BaseMessage]],
+    ) -> None:
+        with _context_cache_lock:
+            _context_cache[key] = entry
+            _context_cache.move_to_end(key)
+            while len(_context_cache) > self.config.cache_size:
+                _context_cache.popitem(last=False)
+    
     def get_conversation_summary(self, thread_id: str) -> Optional[str]:
         """Get AI-generated summary of older conversation"""
         try:
             response = self.client.get(
                 f"/api/v1/chat/conversations/{thread_id}",
             )
+            return self._summary_from_response(response)
             
-            if response.status_code == 404:
-                return None
-            
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", {}).get("summary")
+        except httpx.HTTPError as e:
+            logger.debug("chat_memory_summary_failed", thread_id=thread_id, error=str(e))
+            return None
+    
+    async def get_conversation_summary_async(self, thread_id: str) -> Optional[str]:
+        """Async get_conversation_summary"""
+        try:
+            response = await self.aclient.get(
+                f"/api/v1/chat/conversations/{thread_id}",
+            )
+            return self._summary_from_response(response)
             
-        except httpx.HTTPError:
+        except httpx.HTTPError as e:
+            logger.debug("chat_memory_summary_failed", thread_id=thread_id, error=str(e))
             return None
     
+    @staticmethod
+    def _summary_from_response(response: httpx.Response) -> Optional[str]:
+        if response.status_code == 404:
+            return None
+        
+        response.raise_for_status()
+        data = _parse_json(response)
+        return data.get("data", {}).get("summary")
+    
     def save_message(
         self,
         thread_id: str,
@@ -175,15 +438,16 @@ class MySQLChatMemory:
             if metadata:
                 payload["metadata"] = metadata
             
+            self._invalidate(thread_id)
             response = self.client.post(
                 f"/api/v1/chat/conversations/{thread_id}/messages",
-                json=payload,
+                **_json_body(payload),
             )
             response.raise_for_status()
             return True
             
         except httpx.HTTPError as e:
-            print(f"Error saving message: {e}")
+            logger.warning("chat_memory_save_failed", thread_id=thread_id, error=str(e))
             return False
     
     def save_messages_bulk(
@@ -197,73 +461,101 @@ class MySQLChatMemory:
         Useful for saving the full agent turn (user + tool calls + response).
         """
         try:
-            payload = {
-                "messages": [
-                    self._from_langchain_message(msg)
-                    for msg in messages
-                ]
-            }
+            payload = self._bulk_payload(messages)
             
+            self._invalidate(thread_id)
             response = self.client.post(
                 f"/api/v1/chat/conversations/{thread_id}/messages/bulk",
-                json=payload,
+                **_json_body(payload),
+            )
+            response.raise_for_status()
+            return True
+            
+        except httpx.HTTPError as e:
+            logger.warning(
+                "chat_memory_bulk_save_failed",
+                thread_id=thread_id,
+                message_count=len(messages),
+                error=str(e),
+            )
+            return False
+    
+    async def save_messages_bulk_async(
+        self,
+        thread_id: str,
+        messages: List[BaseMessage],
+    ) -> bool:
+        """Async save_messages_bulk"""
+        try:
+            payload = self._bulk_payload(messages)
+            
+            self._invalidate(thread_id)
+            response = await self.aclient.post(
+                f"/api/v1/chat/conversations/{thread_id}/messages/bulk",
+                **_json_body(payload),
             )
             response.raise_for_status()
             return True
             
         except httpx.HTTPError as e:
-            print(f"Error saving messages: {e}")
+            logger.warning(
+                "chat_memory_bulk_save_failed",
+                thread_id=thread_id,
+                message_count=len(messages),
+                error=str(e),
+            )
             return False
     
+    def _bulk_payload(self, messages: List[BaseMessage]) -> Dict:
+        return {
+            "messages": [
+                self._from_langchain_message(msg)
+                for msg in messages
+            ]
+        }
+    
+    def _invalidate(self, thread_id: str):
+        """Drop cached context for a thread this process is writing to"""
+        with _context_cache_lock:
+            stale = [
+                k for k in _context_cache
+                if k[1] == thread_id and k[0] == self._client_key
+            ]
+            for key in stale:
+                del _context_cache[key]
+    
     def _to_langchain_message(self, msg: Dict) -> Optional[BaseMessage]:
         """Convert API message to LangChain message"""
         role = msg.get("role")
         content = msg.get("content", "")
         
-        if role == "system":
-            return SystemMessage(content=content)
-        
-        elif role == "user":
-            return HumanMessage(content=content)
-        
-        elif role == "assistant":
+        if role == "assistant":
             tool_calls = msg.get("tool_calls")
             if tool_calls:
                 return AIMessage(content=content, tool_calls=tool_calls)
             return AIMessage(content=content)
         
-        elif role == "tool":
+        if role == "tool":
             return ToolMessage(
                 content=content,
                 tool_call_id=msg.get("tool_call_id", ""),
                 name=msg.get("tool_name", ""),
             )
         
-        return None
+        cls = _ROLE_TO_MESSAGE.get(role)
+        return cls(content=content) if cls else None
     
     def _from_langchain_message(self, msg: BaseMessage) -> Dict:
         """Convert LangChain message to API format"""
-        data = {
-            "content": msg.content,
-        }
-        
-        if isinstance(msg, SystemMessage):
-            data["role"] = "system"
-        
-        elif isinstance(msg, HumanMessage):
-            data["role"] = "user"
-        
-        elif isinstance(msg, AIMessage):
-            data["role"] = "assistant"
-            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                data["tool_calls"] = msg.tool_calls
-        
-        elif isinstance(msg, ToolMessage):
-            data["role"] = "tool"
-            data["tool_call_id"] = msg.tool_call_id
-            data["tool_name"] = msg.name
-        
-        return data
+        return _message_encoder(type(msg))(msg)
+
+# Runs summary lookups alongside context fetches in get_messages_for_llm.
+# Sized like the shared connection pool, so concurrent turns don't queue
+# behind each other's summaries (threads start on demand).
+_summary_executor = ThreadPoolExecutor(
+    max_workers=_CLIENT_LIMITS.max_connections,
+    thread_name_prefix="chat-summary",
+)
 
 
 class SlidingWindowMemory:
@@ -284,6 +576,9 @@ class SlidingWindowMemory:
         self.mysql = mysql_memory
         self.max_recent = max_recent_messages
         self.include_summary = include_summary
+        # thread_id -> (summary, SystemMessage), so a summary that hasn't
+        # changed since the last turn reuses its already-validated message
+        self._summary_messages: "OrderedDict[str, Tuple[str, SystemMessage]]" = OrderedDict()
     
     def get_messages_for_llm(self, thread_id: str) -> List[BaseMessage]:
         """
@@ -295,20 +590,52 @@ class SlidingWindowMemory:
         """
         messages = []
         
-        # Get summary if enabled
-        if self.include_summary:
-            summary = self.mysql.get_conversation_summary(thread_id)
+        # The summary is fetched on a worker thread while the recent messages
+        # are fetched here, so the two requests overlap instead of costing
+        # two sequential round trips (the shared client is thread-safe)
+        summary_future = (
+            _summary_executor.submit(self.mysql.get_conversation_summary, thread_id)
+            if self.include_summary else None
+        )
+        recent = self.mysql.get_context_messages(thread_id, self.max_recent)
+        
+        if summary_future is not None:
+            summary = summary_future.result()
             if summary:
-                messages.append(SystemMessage(
-                    content=f"[PREVIOUS CONVERSATION SUMMARY]\n{summary}"
-                ))
+                messages.append(self._summary_message(thread_id, summary))
         
-        # Get recent messages
-        recent = self.mysql.get_context_messages(thread_id, self.max_recent)
         messages.extend(recent)
         
         return messages
     
+    async def get_messages_for_llm_async(self, thread_id: str) -> List[BaseMessage]:
+        """Async get_messages_for_llm; summary and recent messages are fetched concurrently"""
+        recent_task = self.mysql.get_context_messages_async(thread_id, self.max_recent)
+        if self.include_summary:
+            summary, recent = await asyncio.gather(
+                self.mysql.get_conversation_summary_async(thread_id),
+                recent_task,
+            )
+        else:
+            summary, recent = None, await recent_task
+        
+        messages = [self._summary_message(thread_id, summary)] if summary else []
+        messages.extend(recent)
+        return messages
+    
+    def _summary_message(self, thread_id: str, summary: str) -> SystemMessage:
+        cached = self._summary_messages.get(thread_id)
+        if cached and cached[0] == summary:
+            self._summary_messages.move_to_end(thread_id)
+            return cached[1]
+        
+        message = SystemMessage(content=f"[PREVIOUS CONVERSATION SUMMARY]\n{summary}")
+        self._summary_messages[thread_id] = (summary, message)
+        self._summary_messages.move_to_end(thread_id)
+        if len(self._summary_messages) > self.mysql.config.cache_size:
+            self._summary_messages.popitem(last=False)
+        return message
+    
     def save_turn(
         self,
         thread_id: str,
@@ -322,27 +649,38 @@ class SlidingWindowMemory:
             thread_id: Conversation thread ID
             user_message: The user's input
             assistant_messages: All messages from agent (may include tool calls)
+
+        Returns:
+            True if the turn was saved
         """
-        # Save user message
-        self.mysql.save_message(thread_id, "user", user_message)
-        
-        # Save assistant messages (including tool interactions)
-        for msg in assistant_messages:
-            if isinstance(msg, AIMessage):
-                self.mysql.save_message(
-                    thread_id,
-                    "assistant",
-                    msg.content,
-                    tool_calls=msg.tool_calls if hasattr(msg, "tool_calls") else None,
-                )
-            elif isinstance(msg, ToolMessage):
-                self.mysql.save_message(
-                    thread_id,
-                    "tool",
-                    msg.content,
-                    tool_name=msg.name,
-                    tool_call_id=msg.tool_call_id,
-                )
+        return self.mysql.save_messages_bulk(
+            thread_id, self._turn_messages(user_message, assistant_messages)
+        )
+    
+    async def save_turn_async(
+        self,
+        thread_id: str,
+        user_message: str,
+        assistant_messages: List[BaseMessage],
+    ) -> bool:
+        """Async save_turn"""
+        return await self.mysql.save_messages_bulk_async(
+            thread_id, self._turn_messages(user_message, assistant_messages)
+        )
+    
+    @staticmethod
+    def _turn_messages(
+        user_message: str,
+        assistant_messages: List[BaseMessage],
+    ) -> List[BaseMessage]:
+        # The whole turn goes out in one bulk request instead of a round trip
+        # per message; only AI and tool messages are persisted from the agent
+        messages = [HumanMessage(content=user_message)]
+        messages.extend(
+            msg for msg in assistant_messages
+            if isinstance(msg, (AIMessage, ToolMessage))
+        )
+        return messages
 
 
 def create_mysql_memory(
@@ -9,12 +9,12 @@ Provides CRUD operations for:
 """
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, select, update, delete, and_
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, select, update, delete, and_, insert
+from sqlalchemy.orm import sessionmaker, Session, load_only
 from sqlalchemy.exc import SQLAlchemyError
 
 from .models import (
@@ -343,7 +343,20 @@ class ConversationSummaryRepository:
         
         Returns a formatted summary of recent interactions.
         """
-        summaries = self.get_client_history(client_id, limit)
+        # Only the columns used below, so JSON/TOASTed columns stay on disk
+        stmt = (
+            select(ConversationSummary)
+            .options(load_only(
+                ConversationSummary.started_at,
+                ConversationSummary.primary_intent,
+                ConversationSummary.key_topics,
+                ConversationSummary.summary,
+            ))
+            .where(ConversationSummary.client_id == client_id)
+            .order_by(ConversationSummary.started_at.desc())
+            .limit(limit)
+        )
+        summaries = list(self.session.scalars(stmt))
         if not summaries:
             return "No previous conversation history."
         
@@ -525,6 +538,28 @@ class AgentMetricsRepository:
         self.session.flush()
         return metrics
     
+    def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Record many metrics entries in one Core INSERT.
+
+        Rows take the same keys as create(). Skips ORM object construction
+        and the per-row flush; SQLAlchemy 2.0 sends the batch as multi-row
+        INSERT ... VALUES statements ("insertmanyvalues"). Use this when
+        replaying or importing metrics; create() is fine for a single request.
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+        # Same as create(): response_tokens mirrors output_tokens
+        rows = [
+            {"response_tokens": row.get("output_tokens"), **row}
+            for row in rows
+        ]
+        self.session.execute(insert(AgentMetrics), rows)
+        return len(rows)
+    
     def update_evaluation(
         self,
         request_id: str,
@@ -31,6 +31,26 @@ MODEL_ENCODINGS = {
 # Default encoding for unknown models
 DEFAULT_ENCODING = "cl100k_base"
 
+# Pricing per 1M tokens (as of 2024)
+MODEL_PRICING = {
+    "gpt-4o-mini": {
+        "input": 0.15,   # $0.15 per 1M input tokens
+        "output": 0.60,  # $0.60 per 1M output tokens
+    },
+    "gpt-4o": {
+        "input": 2.50,   # $2.50 per 1M input tokens
+        "output": 10.00, # $10.00 per 1M output tokens
+    },
+    "gpt-4-turbo": {
+        "input": 10.00,
+        "output": 30.00,
+    },
+    "gpt-3.5-turbo": {
+        "input": 0.50,
+        "output": 1.50,
+    },
+}
+
 
 @lru_cache(maxsize=10)
 def get_encoding(model: str = "gpt-4o-mini") -> tiktoken.Encoding:
@@ -151,27 +171,7 @@ def estimate_cost(
     Returns:
         Dict with cost breakdown
     """
-    # Pricing per 1M tokens (as of 2024)
-    PRICING = {
-        "gpt-4o-mini": {
-            "input": 0.15,   # $0.15 per 1M input tokens
-            "output": 0.60,  # $0.60 per 1M output tokens
-        },
-        "gpt-4o": {
-            "input": 2.50,   # $2.50 per 1M input tokens
-            "output": 10.00, # $10.00 per 1M output tokens
-        },
-        "gpt-4-turbo": {
-            "input": 10.00,
-            "output": 30.00,
-        },
-        "gpt-3.5-turbo": {
-            "input": 0.50,
-            "output": 1.50,
-        },
-    }
-    
-    pricing = PRICING.get(model, PRICING["gpt-4o-mini"])
+    pricing = MODEL_PRICING.get(model, MODEL_PRICING["gpt-4o-mini"])
     
     input_cost = (input_tokens / 1_000_000) * pricing["input"]
     output_cost = (output_tokens / 1_000_000) * pricing["output"]
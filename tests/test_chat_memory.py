@@ -0,0 +1,245 @@
+"""
+Tests for the MySQL-API chat memory (HTTP mocked with httpx.MockTransport)
+Run: pytest tests/test_chat_memory.py
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.memory import mysql_memory
+from src.memory.mysql_memory import ChatMemoryConfig, MySQLChatMemory, SlidingWindowMemory
+
+
+CONFIG = ChatMemoryConfig(api_url="http://chat.test", api_token="token")
+
+HISTORY = [
+    {"role": "user", "content": "Cari rumah di Sunggal"},
+    {"role": "assistant", "content": "Ada 3 rumah di Sunggal."},
+]
+
+
+class FakeChatAPI:
+    """Minimal chat API: ETag'd history, bulk writes, and a request log."""
+
+    def __init__(self):
+        self.messages = list(HISTORY)
+        self.requests: list[httpx.Request] = []
+        self.summary_delay = 0.0
+
+    @property
+    def etag(self) -> str:
+        return f'"v{len(self.messages)}"'
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if request.method == "GET" and path.endswith("/messages"):
+            if "missing" in path:
+                return httpx.Response(404)
+            if request.headers.get("If-None-Match") == self.etag:
+                return httpx.Response(304, headers={"ETag": self.etag})
+            return httpx.Response(
+                200, json={"data": self.messages}, headers={"ETag": self.etag}
+            )
+        if request.method == "GET" and path.startswith("/api/v1/chat/conversations/"):
+            time.sleep(self.summary_delay)
+            return httpx.Response(200, json={"data": {"summary": "Mencari rumah di Sunggal"}})
+        if request.method == "POST" and path.endswith("/messages/bulk"):
+            self.messages.extend(mysql_memory._parse_json(request)["messages"])
+            return httpx.Response(201, json={"success": True})
+        return httpx.Response(404)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        # Yield so concurrent coroutines run while the request is "in flight"
+        for _ in range(3):
+            await asyncio.sleep(0)
+        return self.handle(request)
+
+
+@pytest.fixture(autouse=True)
+def empty_context_cache():
+    mysql_memory._context_cache.clear()
+    yield
+    mysql_memory._context_cache.clear()
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = FakeChatAPI()
+    monkeypatch.setattr(
+        mysql_memory,
+        "_get_client",
+        lambda config: httpx.Client(
+            **mysql_memory._client_kwargs(config), transport=httpx.MockTransport(api.handle)
+        ),
+    )
+    monkeypatch.setattr(
+        mysql_memory,
+        "_get_async_client",
+        lambda config: httpx.AsyncClient(
+            **mysql_memory._client_kwargs(config),
+            transport=httpx.MockTransport(api.handle_async),
+        ),
+    )
+    return api
+
+
+def test_context_is_revalidated_with_etag(api):
+    memory = MySQLChatMemory(CONFIG)
+
+    first = memory.get_context_messages("t1")
+    second = memory.get_context_messages("t1")
+
+    assert [m.content for m in first] == [m["content"] for m in HISTORY]
+    assert isinstance(first[0], HumanMessage) and isinstance(first[1], AIMessage)
+    assert second == first
+    assert "If-None-Match" not in api.requests[0].headers
+    assert api.requests[1].headers["If-None-Match"] == api.etag
+
+
+def test_context_cache_is_shared_across_instances(api):
+    MySQLChatMemory(CONFIG).get_context_messages("t1")
+    MySQLChatMemory(CONFIG).get_context_messages("t1")
+
+    assert api.requests[1].headers["If-None-Match"] == api.etag
+
+
+def test_own_writes_invalidate_the_context(api):
+    memory = MySQLChatMemory(CONFIG)
+    memory.get_context_messages("t1")
+
+    assert memory.save_messages_bulk("t1", [HumanMessage(content="Budget 1M")])
+    context = memory.get_context_messages("t1")
+
+    assert "If-None-Match" not in api.requests[-1].headers
+    assert context[-1].content == "Budget 1M"
+
+
+def test_missing_conversation_is_empty(api):
+    assert MySQLChatMemory(CONFIG).get_context_messages("missing") == []
+
+
+def test_context_cache_is_bounded(api):
+    memory = MySQLChatMemory(ChatMemoryConfig(api_url="http://chat.test", api_token="token", cache_size=2))
+    for thread_id in ("t1", "t2", "t3"):
+        memory.get_context_messages(thread_id)
+
+    assert [key[1] for key in mysql_memory._context_cache] == ["t2", "t3"]
+
+
+async def test_not_modified_after_concurrent_invalidation(api):
+    memory = MySQLChatMemory(CONFIG)
+    await memory.get_context_messages_async("t1")
+
+    # The save drops the cached entry while the revalidation is in flight;
+    # the 304 must not fail on the missing entry
+    context, saved = await asyncio.gather(
+        memory.get_context_messages_async("t1"),
+        memory.save_messages_bulk_async("t1", []),
+    )
+
+    assert saved
+    assert [m.content for m in context] == [m["content"] for m in HISTORY]
+    assert len(mysql_memory._context_cache) == 1
+
+
+def test_async_clients_are_per_loop_and_released():
+    async def client():
+        return mysql_memory._get_async_client(CONFIG)
+
+    async def same_loop():
+        first, second = await client(), await client()
+        await mysql_memory.aclose_clients()
+        return first, second
+
+    first, second = asyncio.run(same_loop())
+    assert first is second
+    assert first.is_closed
+
+    other = asyncio.run(client())
+    assert other is not first
+    # A later loop drops the closed loop's clients
+    asyncio.run(client())
+    assert all(not loop.is_closed() for loop in mysql_memory._async_clients)
+
+
+TURN = [
+    SystemMessage(content="internal prompt"),
+    AIMessage(
+        content="",
+        tool_calls=[{"name": "search_properties", "args": {"q": "sunggal"}, "id": "call-1"}],
+    ),
+    ToolMessage(content="3 results", tool_call_id="call-1", name="search_properties"),
+    AIMessage(content="Ada 3 rumah di Sunggal."),
+]
+
+
+def _bulk_requests(api):
+    return [r for r in api.requests if r.method == "POST"]
+
+
+def test_save_turn_sends_one_bulk_request(api):
+    memory = SlidingWindowMemory(MySQLChatMemory(CONFIG))
+
+    assert memory.save_turn("t1", "Cari rumah di Sunggal", TURN)
+
+    (request,) = _bulk_requests(api)
+    assert request.url.path == "/api/v1/chat/conversations/t1/messages/bulk"
+    sent = mysql_memory._parse_json(request)["messages"]
+    assert [m["role"] for m in sent] == ["user", "assistant", "tool", "assistant"]
+    assert sent[0]["content"] == "Cari rumah di Sunggal"
+    assert sent[1]["tool_calls"][0]["id"] == "call-1"
+    assert sent[2]["tool_call_id"] == "call-1"
+    assert sent[2]["tool_name"] == "search_properties"
+
+
+async def test_save_turn_async_matches_sync(api):
+    memory = SlidingWindowMemory(MySQLChatMemory(CONFIG))
+
+    assert await memory.save_turn_async("t1", "Cari rumah di Sunggal", TURN)
+    memory.save_turn("t2", "Cari rumah di Sunggal", TURN)
+
+    first, second = _bulk_requests(api)
+    assert mysql_memory._parse_json(first) == mysql_memory._parse_json(second)
+
+
+def test_failed_save_turn_returns_false(monkeypatch):
+    monkeypatch.setattr(
+        mysql_memory,
+        "_get_client",
+        lambda config: httpx.Client(
+            **mysql_memory._client_kwargs(config),
+            transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+        ),
+    )
+    memory = SlidingWindowMemory(MySQLChatMemory(CONFIG))
+
+    assert memory.save_turn("t1", "halo", []) is False
+
+
+def test_summaries_of_concurrent_turns_do_not_queue(api):
+    api.summary_delay = 0.2
+    memory = SlidingWindowMemory(MySQLChatMemory(CONFIG))
+    results: dict[str, list] = {}
+
+    def turn(thread_id: str) -> None:
+        results[thread_id] = memory.get_messages_for_llm(thread_id)
+
+    threads = [threading.Thread(target=turn, args=(f"t{n}",)) for n in range(12)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Twelve 0.2 s summary lookups overlap instead of running four at a time
+    assert time.perf_counter() - began < 0.5
+    for messages in results.values():
+        assert isinstance(messages[0], SystemMessage)
+        assert "Mencari rumah di Sunggal" in messages[0].content
+        assert len(messages) == 1 + len(HISTORY)
@@ -0,0 +1,241 @@
+"""
+Tests for the async embedding batcher in hybrid_search
+Run: pytest tests/test_embedding_cache.py
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.knowledge import hybrid_search
+from src.knowledge.hybrid_search import TwoTierEmbeddingCache, get_cached_embedding_async
+
+
+class FakeEmbeddings:
+    """Stands in for OpenAIEmbeddings: deterministic vectors, counts API calls."""
+
+    model = "fake-embedding"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+        time.sleep(self.delay)
+        return [self.vector(text) for text in texts]
+
+    @staticmethod
+    def vector(text: str) -> list[float]:
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = TwoTierEmbeddingCache(path=None)
+    monkeypatch.setattr(hybrid_search, "_embedding_cache", cache)
+    return cache
+
+
+async def test_concurrent_misses_share_one_request():
+    embeddings = FakeEmbeddings()
+    queries = ["rumah sunggal", "ruko medan", "tanah binjai", "rumah sunggal"]
+
+    vectors = await asyncio.gather(
+        *(get_cached_embedding_async(q, embeddings) for q in queries)
+    )
+
+    assert len(embeddings.calls) == 1
+    assert sorted(embeddings.calls[0]) == ["ruko medan", "rumah sunggal", "tanah binjai"]
+    assert vectors == [FakeEmbeddings.vector(q) for q in queries]
+
+
+async def test_batch_results_are_cached():
+    embeddings = FakeEmbeddings()
+    first = await get_cached_embedding_async("apartemen podomoro", embeddings)
+    second = await get_cached_embedding_async("apartemen podomoro", embeddings)
+
+    assert len(embeddings.calls) == 1
+    assert second == pytest.approx(first, rel=1e-3)
+
+
+def test_threads_with_their_own_event_loops():
+    # Agent tools run each call on a fresh loop, often from parallel threads;
+    # every loop must get its own batcher and resolve its own futures.
+    embeddings = FakeEmbeddings(delay=0.05)
+    results: dict[int, list] = {}
+    errors: list[BaseException] = []
+    start = threading.Barrier(2)
+
+    def worker(n: int) -> None:
+        queries = [f"rumah tipe {n}-{i}" for i in range(3)]
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(get_cached_embedding_async(q, embeddings) for q in queries)),
+                timeout=2,
+            )
+
+        try:
+            start.wait()
+            results[n] = [queries, asyncio.run(run())]
+        except BaseException as e:  # surfaced in the main thread below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(2)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert not errors
+    assert time.perf_counter() - began < 2
+    for queries, vectors in results.values():
+        assert vectors == [FakeEmbeddings.vector(q) for q in queries]
+
+
+def test_batcher_recovers_after_loop_dies_mid_window():
+    embeddings = FakeEmbeddings()
+
+    async def abandon():
+        # Start a miss and return before the batch window closes
+        asyncio.get_running_loop().create_task(
+            get_cached_embedding_async("gudang tembung", embeddings)
+        )
+        await asyncio.sleep(0)
+
+    asyncio.run(abandon())
+    vector = asyncio.run(
+        asyncio.wait_for(get_cached_embedding_async("gudang tembung", embeddings), timeout=2)
+    )
+
+    assert vector == FakeEmbeddings.vector("gudang tembung")
+
+
+async def test_cancelled_flush_does_not_wedge_the_batcher():
+    embeddings = FakeEmbeddings()
+    batcher = hybrid_search._get_embedding_batcher(embeddings, embeddings.model)
+
+    waiter = asyncio.ensure_future(batcher.get("villa", "villa"))
+    await asyncio.sleep(0)
+    batcher._flush_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert batcher._flush_task is None
+
+    assert await asyncio.wait_for(batcher.get("villa", "villa"), timeout=2) == FakeEmbeddings.vector("villa")
+
+
+def test_disk_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("EMBEDDING_CACHE_PATH", raising=False)
+    assert hybrid_search._embedding_cache_path() is None
+
+    path = tmp_path / "embeddings.sqlite3"
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(path))
+    assert hybrid_search._embedding_cache_path() == path
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    path = tmp_path / "embeddings.sqlite3"
+    first = TwoTierEmbeddingCache(path=path)
+    first.put_many("m", [("rumah", [0.5, 1.0]), ("ruko", [2.0, 4.0])])
+
+    second = TwoTierEmbeddingCache(path=path)
+    assert not second.contains("rumah", "m")
+    assert second.get("rumah", "m") == [0.5, 1.0]
+    assert second.get("ruko", "m") == [2.0, 4.0]
+    assert second.get("ruko", "other-model") is None
+    assert second.stats["l2_hits"] == 2
+    assert second.contains("rumah", "m")
+
+
+def test_memory_only_cache_evicts_lru():
+    cache = TwoTierEmbeddingCache(path=None, maxsize=2)
+    cache.put("a", "m", [1.0])
+    cache.put("b", "m", [2.0])
+    cache.get("a", "m")
+    cache.put("c", "m", [3.0])
+
+    assert cache.get("a", "m") == [1.0]
+    assert cache.get("b", "m") is None
+    assert len(cache) == 2
+
+
+def test_cache_is_safe_across_threads(tmp_path):
+    cache = TwoTierEmbeddingCache(path=tmp_path / "embeddings.sqlite3", maxsize=64)
+    errors: list[BaseException] = []
+
+    def hammer(n: int) -> None:
+        try:
+            for i in range(200):
+                key = f"q{(n * 7 + i) % 100}"
+                cache.put(key, "m", [float(i)])
+                cache.get(key, "m")
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(cache) <= 64
+
+
+async def test_batched_misses_are_written_to_disk(tmp_path, monkeypatch):
+    path = tmp_path / "embeddings.sqlite3"
+    monkeypatch.setattr(hybrid_search, "_embedding_cache", TwoTierEmbeddingCache(path=path))
+    embeddings = FakeEmbeddings()
+
+    await asyncio.gather(
+        get_cached_embedding_async("rumah sunggal", embeddings),
+        get_cached_embedding_async("ruko medan", embeddings),
+    )
+
+    reopened = TwoTierEmbeddingCache(path=path)
+    assert reopened.get("rumah sunggal", embeddings.model) == FakeEmbeddings.vector("rumah sunggal")
+    assert reopened.get("ruko medan", embeddings.model) == FakeEmbeddings.vector("ruko medan")
+
+
+def test_http_clients_are_per_loop_and_released():
+    async def client_for(url):
+        return hybrid_search._get_http_client(url)
+
+    async def same_loop():
+        first = await client_for("http://api.test")
+        second = await client_for("http://api.test")
+        await hybrid_search.close_http_clients()
+        return first, second
+
+    first, second = asyncio.run(same_loop())
+    assert first is second
+    assert first.is_closed
+
+    other = asyncio.run(client_for("http://api.test"))
+    assert other is not first
+    # A later loop drops the closed loop's clients
+    asyncio.run(client_for("http://api.test"))
+    assert all(not loop.is_closed() for loop in hybrid_search._http_clients)
+
+
+def test_wording_noise_shares_a_key():
+    assert hybrid_search._norm_key("Rumah taman, yg luas!") == hybrid_search._norm_key("rumah  taman luas")
+    assert hybrid_search._norm_key("  ") == ""
+
+
+def test_queries_differing_in_numbers_or_amenities_never_share_an_embedding(fresh_cache):
+    three = "Cari rumah 3 kamar di Medan harga 2 miliar dan ada garasi"
+    five = "Cari rumah 5 kamar di Medan harga 2 miliar dan ada garasi"
+    no_garage = "Cari rumah 3 kamar di Medan harga 2 miliar dan ada kolam"
+    fresh_cache.put(hybrid_search._norm_key(three), "m", [1.0])
+
+    assert fresh_cache.get(hybrid_search._norm_key(five), "m") is None
+    assert fresh_cache.get(hybrid_search._norm_key(no_garage), "m") is None
+    assert fresh_cache.get(hybrid_search._norm_key(three.upper()), "m") == [1.0]
@@ -0,0 +1,154 @@
+"""
+Tests for constraint-evaluation aggregates in src.evaluation.models
+Run: pytest tests/test_evaluation_models.py
+"""
+
+import pytest
+
+from src.evaluation.models import (
+    ConfusionMatrix,
+    ConstraintResult,
+    Constraints,
+    PropertyCheck,
+    QueryEvaluation,
+)
+
+PASS, FAIL, NA = ConstraintResult.PASS, ConstraintResult.FAIL, ConstraintResult.NA
+
+
+def _check(name: str, **results) -> PropertyCheck:
+    return PropertyCheck(property_id=name, property_name=name, **results)
+
+
+def _evaluation(*checks: PropertyCheck, **kwargs) -> QueryEvaluation:
+    return QueryEvaluation(
+        query_id=1,
+        question="Rumah 3 kamar di Sunggal",
+        category="location",
+        expected_result="has_data",
+        has_results=True,
+        property_checks=list(checks),
+        **kwargs,
+    )
+
+
+def test_aggregates():
+    evaluation = _evaluation(
+        _check("a", location_result=PASS, price_result=PASS),
+        _check("b", location_result=PASS, price_result=FAIL),
+    )
+
+    assert evaluation.mean_cpr == pytest.approx(0.75)
+    assert evaluation.strict_success_count == 1
+    assert evaluation.strict_success_ratio == 0.5
+    assert evaluation.is_success(0.6)
+    assert not evaluation.is_success(0.8)
+    assert evaluation.get_confusion_category(0.8) == "FN"
+
+
+def test_aggregates_follow_constraint_override():
+    # scripts/evaluate_v2.py applies overrides by assigning results in place
+    evaluation = _evaluation(
+        _check("a", location_result=PASS, price_result=FAIL),
+        _check("b", location_result=PASS, price_result=FAIL),
+    )
+    assert evaluation.mean_cpr == 0.5
+    assert not evaluation.is_success()
+
+    for check in evaluation.property_checks:
+        check.price_result = PASS
+
+    assert evaluation.mean_cpr == 1.0
+    assert evaluation.strict_success_count == 2
+    assert evaluation.is_success()
+    assert evaluation.get_confusion_category() == "TP"
+
+
+def test_aggregates_follow_manual_evaluation():
+    check = _check("a", location_result=FAIL)
+    evaluation = _evaluation(check, is_manual_evaluation=True)
+    assert not evaluation.is_success()
+
+    check.is_manual_evaluation = True
+    assert evaluation.has_pending_manual
+    assert not evaluation.is_success()
+
+    check.manual_result = "pass"
+    assert not evaluation.has_pending_manual
+    assert evaluation.mean_cpr == 1.0
+    assert evaluation.is_success()
+
+    check.manual_result = "fail"
+    assert evaluation.mean_cpr == 0.0
+    assert not evaluation.is_success()
+
+
+def test_aggregates_follow_in_place_list_replacement():
+    evaluation = _evaluation(_check("a", price_result=FAIL), _check("b", price_result=FAIL))
+    assert evaluation.mean_cpr == 0.0
+
+    # Same list object, same length: only the contents change
+    evaluation.property_checks[:] = [_check("c", price_result=PASS), _check("d", price_result=PASS)]
+    assert evaluation.mean_cpr == 1.0
+
+    evaluation.property_checks[0] = _check("e", price_result=FAIL)
+    assert evaluation.mean_cpr == 0.5
+    assert evaluation.strict_success_count == 1
+
+
+def test_override_success_wins():
+    evaluation = _evaluation(_check("a", price_result=FAIL))
+    assert not evaluation.is_success()
+
+    evaluation.override_success = True
+    assert evaluation.is_success()
+
+
+def test_confusion_matrix_matches_per_query_categories():
+    evaluations = [
+        _evaluation(_check("a", price_result=PASS)),
+        _evaluation(_check("b", price_result=FAIL)),
+        _evaluation(),
+    ]
+    evaluations[2].expected_result = "no_data"
+    evaluations[2].has_results = False
+
+    cm = ConfusionMatrix.from_evaluations(evaluations)
+    categories = [e.get_confusion_category() for e in evaluations]
+
+    assert (cm.tp, cm.fn, cm.tn, cm.fp) == (
+        categories.count("TP"), categories.count("FN"),
+        categories.count("TN"), categories.count("FP"),
+    )
+    assert categories == ["TP", "FN", "TN"]
+
+
+def test_results_normalized_from_strings():
+    check = _check("a", location_result="pass", price_result="FAIL")
+
+    assert check.location_result is PASS
+    assert check.applicable_results == (PASS, FAIL)
+    assert check.all_results[0] is NA
+
+
+def test_constraints_from_equal_dicts_are_independent():
+    data = {"property_type": "house", "bedrooms": {"min": 3}}
+    first, second = Constraints.from_dict(data), Constraints.from_dict(dict(data))
+    assert first == second
+    assert first is not second
+
+    first.property_type = "land"
+    assert second.property_type == "house"
+
+
+def test_equal_sub_constraints_are_interned_by_value_and_type():
+    first = Constraints.from_dict({"bedrooms": {"min": 3}, "price": {"max": 1_000_000_000}})
+    second = Constraints.from_dict({"bedrooms": {"min": 3}, "price": {"max": 1_000_000_000}})
+    assert first.bedrooms is second.bedrooms
+
+    as_float = Constraints.from_dict({"bedrooms": {"min": 1.0}}).bedrooms
+    as_bool = Constraints.from_dict({"bedrooms": {"min": True}}).bedrooms
+    as_int = Constraints.from_dict({"bedrooms": {"min": 1}}).bedrooms
+    assert type(as_float.min) is float
+    assert type(as_bool.min) is bool
+    assert type(as_int.min) is int
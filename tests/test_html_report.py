@@ -0,0 +1,159 @@
+"""
+Tests for the evaluation HTML report
+Run: pytest tests/test_html_report.py
+"""
+
+import json
+import re
+
+from src.evaluation.html_report import HTMLReportGenerator
+from src.evaluation.models import (
+    ConstraintResult,
+    EvaluationMetrics,
+    PropertyCheck,
+    QueryEvaluation,
+)
+
+PASS, FAIL = ConstraintResult.PASS, ConstraintResult.FAIL
+XSS = '<img src=x onerror="alert(1)">'
+
+GOLD = [{
+    "id": 1,
+    "constraints": {"property_type": "house", "location": {"keywords": ["Sunggal"], "radius_km": 2}},
+    "notes": "Rumah di Sunggal",
+}]
+
+
+def _evaluation(category: str = "location", **check_fields) -> QueryEvaluation:
+    check = PropertyCheck(
+        property_id="p1",
+        property_name="Rumah Sunggal",
+        property_type_result=PASS,
+        location_result=FAIL,
+        **check_fields,
+    )
+    return QueryEvaluation(
+        query_id=1,
+        question="Rumah di Sunggal",
+        category=category,
+        expected_result="has_data",
+        has_results=True,
+        property_checks=[check],
+    )
+
+
+def _raw(**prop) -> list[dict]:
+    base = {
+        "name": "Rumah Sunggal",
+        "property_type": "house",
+        "location": "Sunggal",
+        "slug": "rumah-sunggal",
+        "api_id": 7,
+        "verified": True,
+        "api_data": {"property_type": "house", "location": "Sunggal, Medan"},
+    }
+    base.update(prop)
+    return [{"query_id": 1, "properties": [base]}]
+
+
+def _render(evaluations, raw_results=None, gold_questions=GOLD, **kwargs) -> str:
+    metrics = EvaluationMetrics.from_query_evaluations(evaluations)
+    return HTMLReportGenerator(**kwargs).generate_report(
+        evaluations, metrics, raw_results=raw_results, gold_questions=gold_questions
+    )
+
+
+def _property_details(html: str) -> dict:
+    payload = re.search(r"window\.propertyDetails = (.*?);\n", html).group(1)
+    return json.loads(payload)
+
+
+def test_category_is_escaped():
+    html = _render([_evaluation(category=XSS)], gold_questions=None)
+
+    assert XSS not in html
+    assert 'data-category="&lt;img src=x onerror=&quot;alert(1)&quot;&gt;"' in html
+
+
+def test_detail_values_are_escaped_server_side():
+    html = _render(
+        [_evaluation(location_failure_reason=XSS, location_keyword_match=XSS)],
+        _raw(location=XSS, slug=XSS, property_type=XSS),
+        lazy_properties=False,
+    )
+
+    assert XSS not in html
+    assert "Reason: &lt;img" in html
+
+
+def test_lazy_payload_is_escaped():
+    html = _render(
+        [_evaluation(location_failure_reason=XSS)],
+        _raw(location=XSS, slug=XSS, api_id=XSS),
+    )
+    (detail,) = _property_details(html)["1"]
+
+    assert "<img" not in json.dumps(detail)
+    assert detail["slug"].startswith("&lt;img")
+    location_row = detail["rows"][2]
+    assert location_row[1].startswith("&lt;img")
+    # The failure note stays markup, with the reason itself escaped
+    assert "<small" in location_row[3] and "Reason: &lt;img" in location_row[3]
+
+
+def test_manual_card_fields_are_escaped():
+    evaluation = _evaluation()
+    evaluation.is_manual_evaluation = True
+    evaluation.property_checks[0].is_manual_evaluation = True
+    html = _render(
+        [evaluation],
+        _raw(location=XSS, address=XSS, description=XSS, url_view='javascript:alert(1)'),
+    )
+
+    assert XSS not in html
+    assert 'href="javascript:' not in html
+
+
+def test_script_payload_cannot_close_the_script_block():
+    evaluation = _evaluation()
+    evaluation.property_checks[0].property_name = "</script><script>alert(1)</script>"
+    html = _render([evaluation], gold_questions=None)
+
+    assert "</script><script>alert(1)" not in html
+    assert "\\u003c/script>" in html
+
+
+def test_lazy_report_ships_details_as_json():
+    html = _render([_evaluation()], _raw())
+
+    assert '<div class="props-container" data-qid="1" data-idx="0"></div>' in html
+    assert 'class="property-detail"' not in html.split("<script>")[0]
+    (detail,) = _property_details(html)["1"]
+    assert detail["name"] == "Rumah Sunggal"
+    assert detail["slug"] == "rumah-sunggal"
+    assert [row[5] for row in detail["rows"]] == [
+        "property_type", "listing_type", "location", "price", "bedrooms", "floors",
+    ]
+    assert [row[4] for row in detail["rows"][:3]] == ["pass", "na", "fail"]
+
+
+def test_eager_report_renders_the_same_values():
+    lazy = _render([_evaluation()], _raw())
+    eager = _render([_evaluation()], _raw(), lazy_properties=False)
+
+    assert _property_details(eager) == {}
+    assert 'class="props-container"' not in eager
+    body = eager.split("<script>")[0]
+    (detail,) = _property_details(lazy)["1"]
+    for label, extracted, gold, api_val, _result, _name in detail["rows"]:
+        assert f'<span class="extracted-value">{extracted}</span>' in body
+        assert f'<span class="gold-constraint">{gold}</span>' in body
+        assert f'<span class="api-value">{api_val}</span>' in body
+
+
+def test_queries_without_raw_data_use_the_simple_table():
+    html = _render([_evaluation()], raw_results=None)
+
+    assert _property_details(html) == {}
+    assert 'class="props-container"' not in html
+    assert "<table>" in html
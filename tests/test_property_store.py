@@ -0,0 +1,107 @@
+"""
+Tests for PropertyStore upserts and the ChromaDB fallback search (local ChromaDB, fake embeddings)
+Run: pytest tests/test_property_store.py
+"""
+
+import pytest
+
+from src.knowledge.property_store import PropertyStore
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings that record which texts were embedded."""
+
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self.vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.vector(text)
+
+    @staticmethod
+    def vector(text: str) -> list[float]:
+        return [float(len(text)), float(sum(map(ord, text)) % 101), 1.0]
+
+
+def _listing(n: int, title: str) -> dict:
+    return {"id": n, "title": title, "property_type": "house", "city": "Medan", "price": 1_000_000_000}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    store = PropertyStore(persist_dir=str(tmp_path / "chroma"), hnsw_params={})
+    store.embeddings = FakeEmbeddings()
+    return store
+
+
+async def test_resync_mixing_reused_and_new_vectors_writes_one_batch(store, monkeypatch):
+    assert await store.upsert_many_async([_listing(1, "Rumah A"), _listing(2, "Rumah B")], batch_size=2) == 2
+
+    writes = []
+    upsert_embedded = store._upsert_embedded
+    monkeypatch.setattr(
+        store, "_upsert_embedded",
+        lambda ids, docs, vectors: (writes.append(list(ids)), upsert_embedded(ids, docs, vectors)),
+    )
+    store.embeddings.embedded.clear()
+
+    # Listing 1 is unchanged (stored vector reused), listing 2 is re-embedded
+    count = await store.upsert_many_async([_listing(1, "Rumah A"), _listing(2, "Rumah B baru")], batch_size=2)
+
+    assert count == 2
+    assert writes == [["1", "2"]]
+    assert len(store.embeddings.embedded) == 1 and "Rumah B baru" in store.embeddings.embedded[0]
+    stored = store.collection.get(ids=["1", "2"], include=["documents"])
+    by_id = dict(zip(stored["ids"], stored["documents"]))
+    assert "Rumah B baru" in by_id["2"]
+
+
+def test_tune_sqlite_leaves_rust_backend_untouched(store, tmp_path):
+    import sqlite3
+
+    import chromadb
+
+    from src.knowledge._chroma import tune_sqlite
+
+    vector_store = store.vector_store  # already ran tune_sqlite once
+    if chromadb.__version__.startswith("0."):
+        pytest.skip("Python backend: SqliteDB is a running component")
+
+    assert tune_sqlite(vector_store) is False
+    conn = sqlite3.connect(tmp_path / "chroma" / "chroma.sqlite3")
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal"
+    finally:
+        conn.close()
+
+
+async def test_fallback_search_pushes_title_case_amenities_in_one_query(store, monkeypatch):
+    from src.knowledge import hybrid_search
+    from src.knowledge.hybrid_search import HybridSearchService
+
+    pool = dict(_listing(1, "Rumah Kolam"), description="Ada Kolam Renang pribadi")
+    await store.upsert_many_async([pool, _listing(2, "Rumah Biasa")], batch_size=2)
+
+    calls = []
+    search = store.vector_store.similarity_search_by_vector_with_relevance_scores
+    monkeypatch.setattr(
+        store.vector_store, "similarity_search_by_vector_with_relevance_scores",
+        lambda **kwargs: (calls.append(kwargs), search(**kwargs))[1],
+    )
+
+    async def embed(query, embeddings):
+        return FakeEmbeddings.vector(query)
+
+    monkeypatch.setattr(hybrid_search, "get_cached_embedding_async", embed)
+
+    service = HybridSearchService(property_store=store)
+    result = await service._fallback_semantic_search(
+        None, "rumah kolam renang", amenities=["swimming_pool"], limit=5, enrich_urls=False,
+    )
+
+    assert len(calls) == 1
+    assert [p.id for p in result.properties] == ["1"]